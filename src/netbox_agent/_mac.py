@@ -0,0 +1,13 @@
+"""Shared MAC address normalization."""
+
+# Separator stripping as one C-level translate pass instead of chained
+# str.replace calls; covers colon, hyphen and Cisco dotted formats
+_MAC_STRIP = str.maketrans({"-": "", ":": "", ".": ""})
+
+
+def normalize_mac(mac: bytes | str) -> str:
+    """Normalize a MAC address to lowercase with colons."""
+    if isinstance(mac, bytes):
+        return mac.hex(":")
+    m = str(mac).translate(_MAC_STRIP).lower()
+    return f"{m[0:2]}:{m[2:4]}:{m[4:6]}:{m[6:8]}:{m[8:10]}:{m[10:12]}"
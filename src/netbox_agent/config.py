@@ -1,39 +1,48 @@
 """Configuration management using Pydantic Settings."""
 
-import json
+import functools
 import re
 from datetime import timedelta
 from typing import Any
 
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, TypeAdapter, ValidationError, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Single adapter reused for MLAG JSON: parses and validates the structure
+# in one pass via pydantic's C-backed JSON parser
+_MLAG_ADAPTER: TypeAdapter[dict[str, list[str]]] = TypeAdapter(dict[str, list[str]])
+
+# Duration parsing: compiled once, with static unit multipliers in seconds
+_DURATION_RE = re.compile(r"^(\d+)([smhd])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
 
 def parse_duration(value: str) -> timedelta:
     """Parse duration string like '6h', '30m', '1d' to timedelta."""
-    match = re.match(r"^(\d+)([smhd])$", value.strip().lower())
+    match = _DURATION_RE.match(value.strip().lower())
     if not match:
         raise ValueError(f"Invalid duration format: {value}. Use format like '6h', '30m', '1d'")
 
     amount = int(match.group(1))
     unit = match.group(2)
-
-    units = {
-        "s": timedelta(seconds=amount),
-        "m": timedelta(minutes=amount),
-        "h": timedelta(hours=amount),
-        "d": timedelta(days=amount),
-    }
-    return units[unit]
+    return timedelta(seconds=amount * _UNIT_SECONDS[unit])
 
 
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+    """
+    Application settings loaded from environment variables.
+
+    Derived values (compiled regexes, parsed MLAG JSON, timedeltas) are
+    materialized lazily on first access via the get_* helpers, so
+    constructing Settings stays cheap regardless of which fields a caller
+    actually uses.
+    """
 
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
+        frozen=True,
     )
 
     # NetBox configuration
@@ -48,6 +57,16 @@ class Settings(BaseSettings):
 
     # Polling configuration
     poll_interval: int = Field(300, description="Polling interval in seconds", ge=60)
+    servers_cache_ttl: int = Field(
+        0,
+        description="Seconds to reuse the fetched server/cable topology (0 = refetch every cycle)",
+        ge=0,
+    )
+    switches_cache_ttl: int = Field(
+        0,
+        description="Seconds to reuse the fetched switch inventory (0 = refetch every cycle)",
+        ge=0,
+    )
     move_confirm_runs: int = Field(
         2, description="Number of consecutive runs to confirm a move", ge=1
     )
@@ -57,6 +76,16 @@ class Settings(BaseSettings):
     snmp_version: str = Field("2c", description="SNMP version (2c or 3)")
     snmp_timeout: int = Field(5, description="SNMP timeout in seconds", ge=1)
     snmp_retries: int = Field(2, description="SNMP retry count", ge=0)
+    snmp_workers: int = Field(
+        32, description="Max concurrent switches polled for FDB", ge=1
+    )
+    snmp_max_repetitions: int = Field(
+        50, description="GETBULK max-repetitions per request", ge=1
+    )
+    snmp_backend: str = Field(
+        "auto",
+        description="SNMP backend: 'easysnmp' (net-snmp, fast), 'pysnmp', or 'auto'",
+    )
 
     # Uplink detection
     uplink_ports: str = Field("", description="Comma-separated list of uplink port names")
@@ -83,13 +112,23 @@ class Settings(BaseSettings):
     log_level: str = Field("INFO", description="Log level")
     log_format: str = Field("json", description="Log format (json or text)")
 
+    # Lazily computed caches for derived values (regex compilation, JSON
+    # parsing, duration parsing) so repeated calls don't redo the work
+    _uplink_ports_cache: set[str] | None = PrivateAttr(default=None)
+    _uplink_patterns_cache: list[re.Pattern[str]] | None = PrivateAttr(default=None)
+    _uplink_regex_cache: re.Pattern[str] | None = PrivateAttr(default=None)
+    _uplink_regex_computed: bool = PrivateAttr(default=False)
+    _mlag_groups_cache: dict[str, list[str]] | None = PrivateAttr(default=None)
+    _remind_after_cache: timedelta | None = PrivateAttr(default=None)
+    _switches_filter_cache: dict[str, Any] | None = PrivateAttr(default=None)
+
     @field_validator("mlag_groups")
     @classmethod
     def validate_mlag_groups(cls, v: str) -> str:
-        """Validate MLAG groups is valid JSON."""
+        """Validate MLAG groups is valid JSON with the expected structure."""
         try:
-            json.loads(v)
-        except json.JSONDecodeError as e:
+            _MLAG_ADAPTER.validate_json(v)
+        except ValidationError as e:
             raise ValueError(f"Invalid JSON for MLAG_GROUPS: {e}") from e
         return v
 
@@ -101,29 +140,63 @@ class Settings(BaseSettings):
         return v
 
     def get_uplink_ports(self) -> set[str]:
-        """Get set of uplink port names."""
-        if not self.uplink_ports:
-            return set()
-        return {p.strip() for p in self.uplink_ports.split(",") if p.strip()}
+        """Get set of uplink port names (computed once, then cached)."""
+        if self._uplink_ports_cache is None:
+            if not self.uplink_ports:
+                self._uplink_ports_cache = set()
+            else:
+                self._uplink_ports_cache = {
+                    p.strip() for p in self.uplink_ports.split(",") if p.strip()
+                }
+        return self._uplink_ports_cache
 
     def get_uplink_patterns(self) -> list[re.Pattern[str]]:
-        """Get compiled regex patterns for uplink detection."""
-        if not self.uplink_patterns:
-            return []
-        patterns = []
-        for p in self.uplink_patterns.split(","):
-            p = p.strip()
-            if p:
-                patterns.append(re.compile(p, re.IGNORECASE))
-        return patterns
+        """Get compiled regex patterns for uplink detection (compiled once, then cached)."""
+        if self._uplink_patterns_cache is None:
+            patterns = []
+            if self.uplink_patterns:
+                for p in self.uplink_patterns.split(","):
+                    p = p.strip()
+                    if p:
+                        patterns.append(re.compile(p, re.IGNORECASE))
+            self._uplink_patterns_cache = patterns
+        return self._uplink_patterns_cache
+
+    def get_uplink_regex(self) -> re.Pattern[str] | None:
+        """
+        Get all uplink patterns fused into a single alternation regex.
+
+        One compiled regex means one C-level search per port name instead of
+        one per pattern. Returns None when no patterns are configured.
+        """
+        if not self._uplink_regex_computed:
+            parts = []
+            if self.uplink_patterns:
+                parts = [p.strip() for p in self.uplink_patterns.split(",") if p.strip()]
+            if parts:
+                self._uplink_regex_cache = re.compile(
+                    "|".join(f"(?:{p})" for p in parts), re.IGNORECASE
+                )
+            self._uplink_regex_computed = True
+        return self._uplink_regex_cache
 
     def get_mlag_groups(self) -> dict[str, list[str]]:
-        """Get MLAG groups as dict."""
-        return json.loads(self.mlag_groups)
+        """Get MLAG groups as dict (parsed once, then cached)."""
+        if self._mlag_groups_cache is None:
+            self._mlag_groups_cache = _MLAG_ADAPTER.validate_json(self.mlag_groups)
+        return self._mlag_groups_cache
 
     def get_remind_after_timedelta(self) -> timedelta:
-        """Get remind_after as timedelta."""
-        return parse_duration(self.remind_after)
+        """Get remind_after as timedelta (parsed once, then cached)."""
+        if self._remind_after_cache is None:
+            self._remind_after_cache = parse_duration(self.remind_after)
+        return self._remind_after_cache
+
+    def get_switches_filter(self) -> dict[str, Any]:
+        """Get the configured switches selector parsed once into API filter params."""
+        if self._switches_filter_cache is None:
+            self._switches_filter_cache = self.parse_selector(self.switches_selector)
+        return self._switches_filter_cache
 
     def parse_selector(self, selector: str) -> dict[str, Any]:
         """
@@ -148,19 +221,12 @@ class Settings(BaseSettings):
             raise ValueError(f"Unknown selector type: {key}. Use 'role', 'tag', or 'site'")
 
 
-# Global settings instance (lazy loaded)
-_settings: Settings | None = None
-
-
+@functools.cache
 def get_settings() -> Settings:
-    """Get or create settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = Settings()  # type: ignore[call-arg]
-    return _settings
+    """Get or create settings instance (cached for the process lifetime)."""
+    return Settings()  # type: ignore[call-arg]
 
 
 def reset_settings() -> None:
     """Reset settings (for testing)."""
-    global _settings
-    _settings = None
+    get_settings.cache_clear()
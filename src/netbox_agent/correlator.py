@@ -1,11 +1,14 @@
 """Correlator for comparing expected vs observed MAC locations."""
 
+import functools
 import re
+from collections import defaultdict
 from datetime import datetime
 
 from .config import Settings, get_settings
 from .logging import get_logger
 from .models import (
+    ExpectedEndpoint,
     MoveEvent,
     MoveStatus,
     ObservedEndpoint,
@@ -32,67 +35,85 @@ class Correlator:
         """Initialize correlator."""
         self.settings = settings or get_settings()
         self._uplink_ports = self.settings.get_uplink_ports()
-        self._uplink_patterns = self.settings.get_uplink_patterns()
+        self._uplink_regex = self.settings.get_uplink_regex()
         self._mlag_groups = self.settings.get_mlag_groups()
 
-        # Build reverse MLAG lookup: switch -> group members
-        self._mlag_peers: dict[str, set[str]] = {}
-        for group_name, members in self._mlag_groups.items():
-            member_set = {m.lower() for m in members}
-            for member in members:
-                self._mlag_peers[member.lower()] = member_set
+        # Flatten MLAG groups into an immutable set of ordered peer pairs so
+        # _is_mlag_peer is a single membership test
+        pairs: set[tuple[str, str]] = set()
+        for members in self._mlag_groups.values():
+            lowered = [m.lower() for m in members]
+            for a in lowered:
+                for b in lowered:
+                    if a != b:
+                        pairs.add((a, b))
+        self._mlag_pair_set: frozenset[tuple[str, str]] = frozenset(pairs)
+
+        # Port names recur heavily across FDB entries, so classify each
+        # distinct name once. Instance-scoped cache: uplink config is
+        # immutable for the lifetime of a correlator. With no uplink config
+        # at all, skip the classification machinery entirely.
+        if self._uplink_ports or self._uplink_regex is not None:
+            self._is_uplink_port = functools.lru_cache(maxsize=4096)(
+                self._classify_uplink_port
+            )
+        else:
+            self._is_uplink_port = lambda port_name: False
+
+        # Per-MAC diagnostic logs build throwaway lists/strings; only pay for
+        # that when DEBUG output is actually emitted
+        self._debug_logging = self.settings.log_level.upper() == "DEBUG"
 
-    def _is_uplink_port(self, port_name: str) -> bool:
+    def _classify_uplink_port(self, port_name: str) -> bool:
         """Check if a port is an uplink/trunk port."""
         # Check explicit port list
         if port_name in self._uplink_ports:
             return True
 
-        # Check patterns
-        for pattern in self._uplink_patterns:
-            if pattern.search(port_name):
-                return True
+        # Check the fused pattern regex
+        if self._uplink_regex is not None and self._uplink_regex.search(port_name):
+            return True
 
         return False
 
     def _is_mlag_peer(self, switch1: str, switch2: str) -> bool:
         """Check if two switches are MLAG peers."""
-        switch1_lower = switch1.lower()
-        switch2_lower = switch2.lower()
-
-        peers = self._mlag_peers.get(switch1_lower)
-        if peers and switch2_lower in peers:
-            return True
-
-        return False
+        return (switch1.lower(), switch2.lower()) in self._mlag_pair_set
 
-    def _find_mac_in_fdb(
-        self, mac: str, fdb_data: dict[str, SwitchFdb]
-    ) -> list[ObservedEndpoint]:
+    def _build_mac_index(
+        self, fdb_data: dict[str, SwitchFdb], wanted: set[str]
+    ) -> dict[str, list[ObservedEndpoint]]:
         """
-        Find all occurrences of a MAC address in FDB data.
+        Index FDB entries by lowercased MAC address.
 
-        Returns list of observed endpoints where the MAC was found.
+        Built once per correlation pass so each server lookup is a dict get
+        instead of a linear scan over every FDB entry. Only MACs in `wanted`
+        (the monitored server MACs) are indexed — the rest of the FDB is
+        skipped entirely.
         """
-        mac_lower = mac.lower()
-        results = []
+        index: defaultdict[str, list[ObservedEndpoint]] = defaultdict(list)
 
         for switch_name, switch_fdb in fdb_data.items():
             if switch_fdb.error:
                 continue
 
-            for entry in switch_fdb.entries:
-                if entry.mac_address.lower() == mac_lower:
-                    results.append(
-                        ObservedEndpoint(
-                            switch_name=switch_name,
-                            port_name=entry.port_name,
-                            vlan=entry.vlan,
-                            timestamp=switch_fdb.collected_at,
-                        )
+            collected_at = switch_fdb.collected_at
+            macs_lower, ports, vlans = switch_fdb.columns()
+            for mac_lower, port_name, vlan in zip(
+                macs_lower, ports, vlans, strict=True
+            ):
+                if mac_lower not in wanted:
+                    continue
+                index[mac_lower].append(
+                    ObservedEndpoint(
+                        switch_name=switch_name,
+                        port_name=port_name,
+                        vlan=vlan,
+                        timestamp=collected_at,
                     )
+                )
 
-        return results
+        return index
 
     def _select_best_observation(
         self,
@@ -112,8 +133,8 @@ class Correlator:
         if not observations:
             return None
 
-        if len(observations) > 1:
-            logger.info(
+        if len(observations) > 1 and self._debug_logging:
+            logger.debug(
                 f"MAC found on {len(observations)} ports",
                 ports=[f"{o.switch_name}:{o.port_name}" for o in observations],
             )
@@ -132,13 +153,13 @@ class Correlator:
             expected_lower = expected_switch.lower()
             expected_port_norm = normalize_port_name(expected_port)
             on_expected_switch = [
-                o for o in candidates if o.switch_name.lower() == expected_lower
+                o for o in candidates if o.switch_name_lower == expected_lower
             ]
             if len(on_expected_switch) > 1:
                 # MAC on multiple ports — prefer the non-expected port
                 non_expected_port = [
                     o for o in on_expected_switch
-                    if normalize_port_name(o.port_name) != expected_port_norm
+                    if o.port_norm != expected_port_norm
                 ]
                 if non_expected_port:
                     return non_expected_port[0]
@@ -161,22 +182,28 @@ class Correlator:
             List of MoveEvent objects describing the status of each MAC
         """
         events = []
+        # One timestamp per pass: these fields only need "roughly now", so
+        # avoid constructing a datetime per event
+        now = datetime.utcnow()
+        wanted = {server.mac_lower for server in servers}
+        mac_index = self._build_mac_index(fdb_data, wanted)
 
         for server in servers:
             mac = server.mac
             expected = server.expected_endpoint
 
             # Find MAC in FDB
-            observations = self._find_mac_in_fdb(mac, fdb_data)
-
-            logger.info(
-                f"MAC lookup result",
-                server=server.server_name,
-                mac=mac,
-                expected=f"{expected.switch_name}:{expected.port_name}" if expected else None,
-                found_on=[f"{o.switch_name}:{o.port_name}" for o in observations],
-                found_count=len(observations),
-            )
+            observations = mac_index.get(server.mac_lower, [])
+
+            if self._debug_logging:
+                logger.debug(
+                    f"MAC lookup result",
+                    server=server.server_name,
+                    mac=mac,
+                    expected=f"{expected.switch_name}:{expected.port_name}" if expected else None,
+                    found_on=[f"{o.switch_name}:{o.port_name}" for o in observations],
+                    found_count=len(observations),
+                )
 
             if not observations:
                 # MAC not found in any FDB
@@ -186,6 +213,8 @@ class Correlator:
                         expected=expected,
                         observed=None,
                         status=MoveStatus.NOT_FOUND,
+                        first_seen=now,
+                        last_seen=now,
                     )
                 )
                 logger.debug(
@@ -207,6 +236,8 @@ class Correlator:
                         expected=expected,
                         observed=None,
                         status=MoveStatus.NOT_FOUND,
+                        first_seen=now,
+                        last_seen=now,
                     )
                 )
                 continue
@@ -220,6 +251,8 @@ class Correlator:
                     expected=expected,
                     observed=observed,
                     status=status,
+                    first_seen=now,
+                    last_seen=now,
                 )
             )
 
@@ -262,23 +295,30 @@ class Correlator:
 
     def _determine_status(
         self,
-        expected: "ExpectedEndpoint | None",
+        expected: ExpectedEndpoint | None,
         observed: ObservedEndpoint,
     ) -> MoveStatus:
-        """Determine the status of a MAC observation."""
-        from .models import ExpectedEndpoint
+        """
+        Determine the status of a MAC observation.
 
+        Checks are ordered cheapest-first on the common OK path: plain field
+        comparisons on pre-normalized names, then the MLAG pair lookup, then
+        the uplink classification.
+        """
         if expected is None:
             # No expected endpoint - can't compare
             return MoveStatus.MOVE_DETECTED
 
-        # Check for exact match
-        if observed.matches(expected):
+        # Check for exact match on pre-normalized fields
+        if (
+            observed.switch_name_lower == expected.switch_name_lower
+            and observed.port_norm == expected.port_norm
+        ):
             return MoveStatus.OK
 
         # Check if on MLAG peer (same port name, different switch in same MLAG group)
-        if self._is_mlag_peer(expected.switch_name, observed.switch_name):
-            if normalize_port_name(observed.port_name) == normalize_port_name(expected.port_name):
+        if (expected.switch_name_lower, observed.switch_name_lower) in self._mlag_pair_set:
+            if observed.port_norm == expected.port_norm:
                 return MoveStatus.OK_MLAG_PEER
             # Different port on MLAG peer - still a move
             # But could be normal for certain MLAG configurations
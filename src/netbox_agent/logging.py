@@ -42,7 +42,7 @@ def setup_logging(level: str = "INFO", log_format: str = "json") -> None:
             ],
             wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
             context_class=dict,
-            logger_factory=structlog.PrintLoggerFactory(),
+            logger_factory=structlog.WriteLoggerFactory(file=sys.stdout),
             cache_logger_on_first_use=True,
         )
     else:
@@ -55,7 +55,7 @@ def setup_logging(level: str = "INFO", log_format: str = "json") -> None:
             ],
             wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
             context_class=dict,
-            logger_factory=structlog.PrintLoggerFactory(),
+            logger_factory=structlog.WriteLoggerFactory(file=sys.stdout),
             cache_logger_on_first_use=True,
         )
 
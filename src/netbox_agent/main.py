@@ -1,8 +1,12 @@
 """Main entry point for NetBox IPMI Move Auditor."""
 
+import random
 import signal
 import sys
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import NoReturn
 
@@ -17,6 +21,16 @@ from .state import StateManager
 
 logger = get_logger(__name__)
 
+# Error backoff: starts at the base, grows gently per consecutive failure
+# and is capped so a long outage doesn't push retries out indefinitely
+ERROR_BACKOFF_BASE = 60.0
+ERROR_BACKOFF_FACTOR = 1.3
+ERROR_BACKOFF_MAX = 600.0
+
+# Statuses meaning "MAC is where it should be": frozenset membership is a
+# single hash probe per event instead of a tuple scan
+_OK_STATUSES = frozenset({MoveStatus.OK, MoveStatus.OK_MLAG_PEER})
+
 
 class IpmiMoveAuditor:
     """Main agent that monitors IPMI MAC moves."""
@@ -28,30 +42,37 @@ class IpmiMoveAuditor:
         self.snmp = SnmpCollector(self.settings)
         self.correlator = Correlator(self.settings)
         self.state = StateManager(self.settings)
-        self.notifier = NetBoxNotifier(self.settings)
+        self.notifier = NetBoxNotifier(self.settings, session=self.netbox.http_session)
         self._running = True
+        self._consecutive_errors = 0
+        self._shutdown = threading.Event()
 
     def _signal_handler(self, signum: int, frame) -> None:
         """Handle shutdown signals."""
         logger.info(f"Received signal {signum}, shutting down...")
         self._running = False
+        self._shutdown.set()
 
     def _process_events(self, events: list[MoveEvent]) -> None:
         """Process correlation events and send alerts if needed."""
         confirm_threshold = self.settings.move_confirm_runs
         move_tag = self.settings.move_tag_name
 
+        # Tag changes are accumulated over the loop and flushed in one bulk
+        # call instead of one HTTP round trip per event
+        to_tag: set[int] = set()
+        to_untag: set[int] = set()
+
+        # Persist all state transitions in one transaction up front
+        counters = self.state.update_states(events)
+
         for event in events:
-            # Update state and get counter
-            counter = self.state.update_state(event)
+            counter = counters.get(event.server.mac, 0)
 
             # Handle OK status - remove tag if present
-            if event.status in (MoveStatus.OK, MoveStatus.OK_MLAG_PEER):
+            if event.status in _OK_STATUSES:
                 # Remove move tag when server returns to expected location
-                self.netbox.remove_tag_from_device(
-                    event.server.interface.device_id,
-                    move_tag,
-                )
+                to_untag.add(event.server.interface.device_id)
                 continue
 
             # Only process MOVE_DETECTED events
@@ -72,37 +93,41 @@ class IpmiMoveAuditor:
                 )
                 continue
 
-            # Move is confirmed - mark as such
+            # Move is confirmed - mark as such. Bind the endpoint fields to
+            # locals once; the log call and AlertInfo below reuse them.
+            expected = event.expected
+            observed = event.observed
+            expected_switch = expected.switch_name if expected else "Unknown"
+            expected_port = expected.port_name if expected else "Unknown"
+            observed_switch = observed.switch_name if observed else "Unknown"
+            observed_port = observed.port_name if observed else "Unknown"
+
             event.status = MoveStatus.MOVE_CONFIRMED
             logger.warning(
                 f"Move CONFIRMED after {counter} consecutive observations",
                 server=event.server.server_name,
                 counter=counter,
-                expected=f"{event.expected.switch_name}:{event.expected.port_name}" if event.expected else "Unknown",
-                observed=f"{event.observed.switch_name}:{event.observed.port_name}" if event.observed else "Unknown",
+                expected=f"{expected_switch}:{expected_port}",
+                observed=f"{observed_switch}:{observed_port}",
             )
 
             # Add move tag to device (triggers NetBox Webhook)
-            self.netbox.add_tag_to_device(
-                event.server.interface.device_id,
-                move_tag,
-            )
+            to_tag.add(event.server.interface.device_id)
 
-            # Check if we should send alert (deduplication)
-            should_send, is_reminder = self.state.should_send_alert(
+            # Check deduplication and fetch first-seen in one DB round trip
+            should_send, is_reminder, first_detected = self.state.check_and_fetch(
                 event.server.mac,
-                event.observed,
+                observed,
             )
 
             if not should_send:
                 logger.debug(
-                    f"Skipping alert (already sent recently)",
+                    "Skipping alert (already sent recently)",
                     server=event.server.server_name,
                 )
                 continue
 
             # Build and send alert
-            first_detected = self.state.get_first_move_time(event.server.mac)
             if first_detected is None:
                 first_detected = datetime.utcnow()
 
@@ -111,12 +136,12 @@ class IpmiMoveAuditor:
                 server_url=event.server.interface.netbox_url,
                 mac_address=event.server.mac,
                 ip_address=event.server.interface.ip_address,
-                expected_switch=event.expected.switch_name if event.expected else "Unknown",
-                expected_port=event.expected.port_name if event.expected else "Unknown",
-                expected_url=event.expected.netbox_url if event.expected else None,
-                observed_switch=event.observed.switch_name if event.observed else "Unknown",
-                observed_port=event.observed.port_name if event.observed else "Unknown",
-                observed_vlan=event.observed.vlan if event.observed else None,
+                expected_switch=expected_switch,
+                expected_port=expected_port,
+                expected_url=expected.netbox_url if expected else None,
+                observed_switch=observed_switch,
+                observed_port=observed_port,
+                observed_vlan=observed.vlan if observed else None,
                 consecutive_count=counter,
                 first_detected=first_detected,
                 is_reminder=is_reminder,
@@ -126,7 +151,7 @@ class IpmiMoveAuditor:
                 if self.notifier.send_alert(alert):
                     self.state.record_alert(
                         event.server.mac,
-                        event.observed,
+                        observed,
                         is_reminder,
                     )
                     logger.info(
@@ -140,26 +165,39 @@ class IpmiMoveAuditor:
                     error=str(e),
                 )
 
+        # Flush accumulated tag changes in a single bulk call
+        self.netbox.bulk_update_tags(to_tag, to_untag, move_tag)
+
     def run_once(self) -> None:
         """Run a single poll cycle."""
         logger.info("Starting poll cycle")
         cycle_start = time.time()
 
         try:
-            # Step 1: Get servers with IPMI from NetBox
-            servers = self.netbox.get_servers_with_ipmi()
+            # The server fetch is independent of the switch fetch and SNMP
+            # collection, so it runs concurrently: cycle time becomes
+            # max(servers, switches + snmp) instead of their sum.
+            _ = self.netbox.api  # materialize the lazy client before concurrent use
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Step 1 (in background): get servers with IPMI from NetBox
+                servers_future = executor.submit(self.netbox.get_servers_with_ipmi)
+
+                # Step 2: Get switches for FDB collection
+                switches = self.netbox.get_switches()
+                if not switches:
+                    logger.warning("No switches found for FDB collection")
+                    servers_future.result()
+                    return
+
+                # Step 3: Collect FDB from all switches
+                fdb_data = self.snmp.collect_all(switches)
+
+                servers = servers_future.result()
+
             if not servers:
                 logger.warning("No servers with IPMI interfaces found")
                 return
-
-            # Step 2: Get switches for FDB collection
-            switches = self.netbox.get_switches()
-            if not switches:
-                logger.warning("No switches found for FDB collection")
-                return
-
-            # Step 3: Collect FDB from all switches
-            fdb_data = self.snmp.collect_all(switches)
             successful = sum(1 for fdb in fdb_data.values() if not fdb.error)
             logger.info(
                 f"FDB collection complete",
@@ -171,14 +209,12 @@ class IpmiMoveAuditor:
             events = self.correlator.correlate(servers, fdb_data)
 
             # Count by status
-            status_counts = {}
-            for event in events:
-                status_counts[event.status.value] = status_counts.get(event.status.value, 0) + 1
+            status_counts = Counter(event.status.value for event in events)
 
             logger.info(
                 f"Correlation complete",
                 total_macs=len(events),
-                status_counts=status_counts,
+                status_counts=dict(status_counts),
             )
 
             # Step 5: Process events and send alerts
@@ -218,21 +254,32 @@ class IpmiMoveAuditor:
         while self._running:
             try:
                 self.run_once()
+                self._consecutive_errors = 0
 
-                # Sleep until next cycle
+                # Sleep until next cycle; the event wakes us immediately
+                # on shutdown instead of polling once a second
                 if self._running:
-                    logger.debug(f"Sleeping for {self.settings.poll_interval} seconds")
-                    # Sleep in small increments to allow quick shutdown
-                    for _ in range(self.settings.poll_interval):
-                        if not self._running:
-                            break
-                        time.sleep(1)
+                    logger.debug("Sleeping until next cycle", seconds=self.settings.poll_interval)
+                    self._shutdown.wait(timeout=self.settings.poll_interval)
 
             except Exception as e:
                 logger.exception(f"Unexpected error: {e}")
-                # Sleep before retry on error
-                time.sleep(60)
+                # Exponential backoff with jitter before retry: repeated
+                # failures wait progressively longer, and the jitter keeps
+                # a fleet of agents from retrying in lockstep
+                self._consecutive_errors += 1
+                backoff = min(
+                    ERROR_BACKOFF_MAX,
+                    ERROR_BACKOFF_BASE * ERROR_BACKOFF_FACTOR ** (self._consecutive_errors - 1),
+                )
+                backoff *= random.uniform(0.9, 1.1)
+                logger.info(
+                    f"Backing off for {round(backoff)} seconds",
+                    consecutive_errors=self._consecutive_errors,
+                )
+                self._shutdown.wait(timeout=backoff)
 
+        self.state.close()
         logger.info("Agent shutdown complete")
         sys.exit(0)
 
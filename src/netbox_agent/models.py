@@ -1,31 +1,43 @@
 """Data models for NetBox IPMI Agent."""
 
+import functools
 import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
-# Port name normalization: long SNMP names → short NetBox names
-_PORT_PREFIXES = [
-    (re.compile(r"^40GigabitEthernet", re.IGNORECASE), "40GE"),
-    (re.compile(r"^TwentyFiveGigE", re.IGNORECASE), "25GE"),
-    (re.compile(r"^TenGigabitEthernet", re.IGNORECASE), "10GE"),
-    (re.compile(r"^TenGigE", re.IGNORECASE), "10GE"),
-    (re.compile(r"^GigabitEthernet", re.IGNORECASE), "GE"),
-    (re.compile(r"^FastEthernet", re.IGNORECASE), "FE"),
-    (re.compile(r"^HundredGigE", re.IGNORECASE), "100GE"),
-    (re.compile(r"^Ethernet", re.IGNORECASE), "Eth"),
-    (re.compile(r"^Vlanif", re.IGNORECASE), "Vlanif"),
-    (re.compile(r"^LoopBack", re.IGNORECASE), "LoopBack"),
-    (re.compile(r"^Eth-Trunk", re.IGNORECASE), "Eth-Trunk"),
-    (re.compile(r"^Port-channel", re.IGNORECASE), "Po"),
-]
-
-
+# Port name normalization: long SNMP names → short NetBox names.
+# All prefixes are fused into one anchored alternation (leftmost alternative
+# wins, so more specific names come before their substrings) plus a dispatch
+# map, giving a single regex scan per name instead of one per prefix.
+_PORT_PREFIX_MAP = {
+    "40gigabitethernet": "40GE",
+    "twentyfivegige": "25GE",
+    "tengigabitethernet": "10GE",
+    "tengige": "10GE",
+    "gigabitethernet": "GE",
+    "fastethernet": "FE",
+    "hundredgige": "100GE",
+    "ethernet": "Eth",
+    "vlanif": "Vlanif",
+    "loopback": "LoopBack",
+    "eth-trunk": "Eth-Trunk",
+    "port-channel": "Po",
+}
+_PORT_PREFIX_RE = re.compile(
+    "^(" + "|".join(re.escape(p) for p in _PORT_PREFIX_MAP) + ")",
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=2048)
 def normalize_port_name(name: str) -> str:
     """
     Normalize port name to short form for comparison.
 
+    Cached: port names form a small closed vocabulary repeated across many
+    FDB entries, so each distinct name is normalized once per process.
+
     Examples:
         GigabitEthernet0/0/7  → ge0/0/7
         GE0/0/7               → ge0/0/7
@@ -33,8 +45,10 @@ def normalize_port_name(name: str) -> str:
         10GE1/0/1             → 10ge1/0/1
     """
     normalized = name.strip()
-    for pattern, short in _PORT_PREFIXES:
-        normalized = pattern.sub(short, normalized)
+    match = _PORT_PREFIX_RE.match(normalized)
+    if match:
+        short = _PORT_PREFIX_MAP[match.group(1).lower()]
+        normalized = short + normalized[match.end():]
     return normalized.lower()
 
 
@@ -49,7 +63,7 @@ class MoveStatus(str, Enum):
     NOT_FOUND = "not_found"  # MAC not found in FDB
 
 
-@dataclass
+@dataclass(slots=True)
 class IpmiInterface:
     """IPMI interface information from NetBox."""
 
@@ -60,9 +74,14 @@ class IpmiInterface:
     mac_address: str
     ip_address: str | None = None
     netbox_url: str | None = None  # Link to device in NetBox
+    # Lowercased once at construction so lookups don't re-normalize per scan
+    mac_lower: str = field(init=False, repr=False)
 
+    def __post_init__(self) -> None:
+        self.mac_lower = self.mac_address.lower()
 
-@dataclass
+
+@dataclass(slots=True)
 class ExpectedEndpoint:
     """Expected cable endpoint from NetBox."""
 
@@ -72,9 +91,17 @@ class ExpectedEndpoint:
     port_name: str
     cable_id: int | None = None
     netbox_url: str | None = None  # Link to switch in NetBox
+    # Normalized once at construction so comparisons read fields instead of
+    # re-lowering/re-normalizing per check
+    switch_name_lower: str = field(init=False, repr=False)
+    port_norm: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.switch_name_lower = self.switch_name.lower()
+        self.port_norm = normalize_port_name(self.port_name)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerIpmi:
     """Server with IPMI interface and expected endpoint."""
 
@@ -85,12 +112,16 @@ class ServerIpmi:
     def mac(self) -> str:
         return self.interface.mac_address
 
+    @property
+    def mac_lower(self) -> str:
+        return self.interface.mac_lower
+
     @property
     def server_name(self) -> str:
         return self.interface.device_name
 
 
-@dataclass
+@dataclass(slots=True)
 class ObservedEndpoint:
     """Observed MAC location from FDB."""
 
@@ -98,27 +129,38 @@ class ObservedEndpoint:
     port_name: str
     vlan: int | None = None
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    switch_name_lower: str = field(init=False, repr=False)
+    port_norm: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.switch_name_lower = self.switch_name.lower()
+        self.port_norm = normalize_port_name(self.port_name)
 
     def matches(self, expected: ExpectedEndpoint | None) -> bool:
         """Check if this observed endpoint matches expected."""
         if expected is None:
             return False
         return (
-            self.switch_name.lower() == expected.switch_name.lower()
-            and normalize_port_name(self.port_name) == normalize_port_name(expected.port_name)
+            self.switch_name_lower == expected.switch_name_lower
+            and self.port_norm == expected.port_norm
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FdbEntry:
     """Single FDB (MAC address table) entry."""
 
     mac_address: str
     port_name: str
     vlan: int | None = None
+    # Lowercased once at construction so lookups don't re-normalize per scan
+    mac_lower: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.mac_lower = self.mac_address.lower()
 
 
-@dataclass
+@dataclass(slots=True)
 class SwitchFdb:
     """FDB entries from a switch."""
 
@@ -126,9 +168,28 @@ class SwitchFdb:
     entries: list[FdbEntry] = field(default_factory=list)
     collected_at: datetime = field(default_factory=datetime.utcnow)
     error: str | None = None  # If collection failed
-
-
-@dataclass
+    _columns: "tuple[list[str], list[str], list[int | None]] | None" = field(
+        default=None, init=False, repr=False
+    )
+
+    def columns(self) -> tuple[list[str], list[str], list[int | None]]:
+        """
+        Column (structure-of-arrays) view of the entries: parallel lists of
+        (macs_lower, port_names, vlans).
+
+        The hot correlation loop only touches these three values per entry;
+        iterating tight parallel lists avoids chasing one object per entry.
+        Built lazily on first use and cached.
+        """
+        if self._columns is None:
+            macs_lower = [e.mac_lower for e in self.entries]
+            ports = [e.port_name for e in self.entries]
+            vlans = [e.vlan for e in self.entries]
+            self._columns = (macs_lower, ports, vlans)
+        return self._columns
+
+
+@dataclass(slots=True)
 class MoveEvent:
     """A detected IPMI move event."""
 
@@ -141,7 +202,7 @@ class MoveEvent:
     last_seen: datetime = field(default_factory=datetime.utcnow)
 
 
-@dataclass
+@dataclass(slots=True)
 class AlertInfo:
     """Information for an alert to be sent."""
 
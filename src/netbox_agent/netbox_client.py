@@ -1,10 +1,15 @@
 """NetBox API client for reading server IPMI information and cabling."""
 
+import time
+from collections import defaultdict
 from typing import Any
 
 import pynetbox
+import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from ._mac import normalize_mac
 from .config import Settings, get_settings
 from .logging import get_logger
 from .models import ExpectedEndpoint, IpmiInterface, ServerIpmi
@@ -23,6 +28,45 @@ class NetBoxClient:
         """Initialize NetBox client."""
         self.settings = settings or get_settings()
         self._api: pynetbox.api | None = None
+        self._session: requests.Session | None = None
+        # Tag slugs are stable once created; cache slug -> id so repeated
+        # tagging doesn't re-query the same tag every time
+        self._tag_id_cache: dict[str, int] = {}
+        # Optional cross-cycle reuse of slow-changing topology (servers
+        # with cabling, switch inventory)
+        self._servers_cache: list[ServerIpmi] | None = None
+        self._servers_cache_at: float = 0.0
+        self._switches_cache: list[dict[str, Any]] | None = None
+        self._switches_cache_at: float = 0.0
+        # Per-run memoization for cable endpoint resolution: servers racked
+        # together share switch-side interfaces, so repeat GETs are common
+        self._cable_cache: dict[int, Any] = {}
+        self._remote_iface_cache: dict[int, Any] = {}
+
+    @property
+    def http_session(self) -> requests.Session:
+        """
+        Get or create the shared HTTP session.
+
+        A persistent session reuses TCP/TLS connections across the hundreds
+        of GETs a poll cycle issues; without it every call pays a fresh
+        handshake. The session is also handed to the notifier so journal
+        POSTs ride the same connection pool.
+        """
+        if self._session is None:
+            session = requests.Session()
+            session.verify = self.settings.netbox_verify_ssl
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(
+                {
+                    "Authorization": f"Token {self.settings.netbox_token}",
+                    "Accept": "application/json",
+                }
+            )
+            self._session = session
+        return self._session
 
     @property
     def api(self) -> pynetbox.api:
@@ -32,21 +76,12 @@ class NetBoxClient:
                 self.settings.netbox_url,
                 token=self.settings.netbox_token,
             )
-            if not self.settings.netbox_verify_ssl:
-                # Disable SSL verification if configured
-                import requests
-
-                session = requests.Session()
-                session.verify = False
-                self._api.http_session = session
+            self._api.http_session = self.http_session
         return self._api
 
     def _normalize_mac(self, mac: str) -> str:
         """Normalize MAC address to lowercase with colons."""
-        # Remove common separators and convert to lowercase
-        mac = mac.lower().replace("-", "").replace(":", "").replace(".", "")
-        # Insert colons
-        return ":".join(mac[i : i + 2] for i in range(0, 12, 2))
+        return normalize_mac(mac)
 
     @retry(
         stop=stop_after_attempt(3),
@@ -62,14 +97,51 @@ class NetBoxClient:
         Returns:
             List of ServerIpmi objects with expected endpoints.
         """
+        # Cable topology changes rarely; with SERVERS_CACHE_TTL set, reuse
+        # the previously built list instead of re-fetching every cycle.
+        # (NetBox doesn't serve ETags, so this is time- rather than
+        # validation-based.)
+        ttl = self.settings.servers_cache_ttl
+        if (
+            ttl > 0
+            and self._servers_cache is not None
+            and time.monotonic() - self._servers_cache_at < ttl
+        ):
+            logger.debug("Using cached server topology", servers=len(self._servers_cache))
+            return self._servers_cache
+
         logger.info("Fetching devices with OOB IP from NetBox")
 
+        # Fresh fetch: drop endpoint memoization from the previous run
+        self._cable_cache.clear()
+        self._remote_iface_cache.clear()
+
         servers: list[ServerIpmi] = []
 
         # Get all devices that have oob_ip set
         # NetBox API: has_oob_ip=True filters devices with OOB IP assigned
-        devices = list(self.api.dcim.devices.filter(has_oob_ip=True))
-        logger.debug(f"Found {len(devices)} devices with OOB IP")
+        # exclude=config_context drops the rendered config context from each
+        # device payload - by far the largest serializer field and one the
+        # auditor never reads
+        devices = list(
+            self.api.dcim.devices.filter(has_oob_ip=True, exclude="config_context")
+        )
+        logger.debug("Found devices with OOB IP", count=len(devices))
+
+        # Prefetch interfaces and IP assignments for the whole device set in
+        # two paginated queries; resolving the OOB interface then becomes an
+        # in-memory lookup instead of one request per device per interface
+        device_ids = [d.id for d in devices]
+        ifaces_by_device: dict[int, list[Any]] = defaultdict(list)
+        if device_ids:
+            for iface in self.api.dcim.interfaces.filter(device_id=device_ids):
+                ifaces_by_device[iface.device.id].append(iface)
+
+        ip_to_iface: dict[int, int] = {}
+        if device_ids:
+            for ip in self.api.ipam.ip_addresses.filter(device_id=device_ids):
+                if ip.assigned_object_type == "dcim.interface" and ip.assigned_object_id:
+                    ip_to_iface[ip.id] = ip.assigned_object_id
 
         for device in devices:
             # Get OOB IP address from device
@@ -79,7 +151,11 @@ class NetBoxClient:
 
             # Find the interface that has the OOB IP assigned
             # This is the IPMI/iLO/iDRAC interface
-            oob_interface = self._find_oob_interface(device)
+            oob_interface = self._find_oob_interface(
+                device,
+                ifaces_by_device.get(device.id, []),
+                ip_to_iface,
+            )
 
             if oob_interface is None:
                 logger.debug(
@@ -128,9 +204,16 @@ class NetBoxClient:
             )
 
         logger.info(f"Found {len(servers)} devices with connected OOB interfaces")
+        self._servers_cache = servers
+        self._servers_cache_at = time.monotonic()
         return servers
 
-    def _find_oob_interface(self, device: Any) -> Any | None:
+    def _find_oob_interface(
+        self,
+        device: Any,
+        interfaces: list[Any],
+        ip_to_iface: dict[int, int],
+    ) -> Any | None:
         """
         Find the OOB (IPMI/iLO/iDRAC) interface for a device.
 
@@ -140,6 +223,8 @@ class NetBoxClient:
 
         Args:
             device: pynetbox device object with oob_ip
+            interfaces: Prefetched interfaces for this device
+            ip_to_iface: Prefetched map of IP address ID to interface ID
 
         Returns:
             Interface object or None
@@ -147,16 +232,11 @@ class NetBoxClient:
         if not device.oob_ip:
             return None
 
-        # Get all interfaces for this device
-        interfaces = list(self.api.dcim.interfaces.filter(device_id=device.id))
-
-        # Strategy 1: Find interface with oob_ip assigned
-        oob_ip_id = device.oob_ip.id
-        for iface in interfaces:
-            # Check if this interface has the OOB IP
-            ip_addresses = list(self.api.ipam.ip_addresses.filter(interface_id=iface.id))
-            for ip in ip_addresses:
-                if ip.id == oob_ip_id:
+        # Strategy 1: Find interface with oob_ip assigned (from prefetched map)
+        oob_iface_id = ip_to_iface.get(device.oob_ip.id)
+        if oob_iface_id is not None:
+            for iface in interfaces:
+                if iface.id == oob_iface_id:
                     return iface
 
         # Strategy 2: Fallback to name matching
@@ -186,10 +266,14 @@ class NetBoxClient:
             return None
 
         try:
-            # Get the cable details
-            cable = self.api.dcim.cables.get(interface.cable.id)
-            if not cable:
-                return None
+            # Get the cable details (memoized per run)
+            cable_id = interface.cable.id
+            cable = self._cable_cache.get(cable_id)
+            if cable is None:
+                cable = self.api.dcim.cables.get(cable_id)
+                if not cable:
+                    return None
+                self._cable_cache[cable_id] = cable
 
             # Find the remote endpoint (not our interface)
             # Cables have a_terminations and b_terminations
@@ -212,11 +296,17 @@ class NetBoxClient:
             if remote_iface is None:
                 return None
 
-            # Get full interface details if needed
+            # Get full interface details if needed (memoized per run: the
+            # same switch interface can terminate cables for many servers)
             if not hasattr(remote_iface, 'device') or remote_iface.device is None:
-                remote_iface = self.api.dcim.interfaces.get(remote_iface.id)
-                if not remote_iface:
-                    return None
+                cached = self._remote_iface_cache.get(remote_iface.id)
+                if cached is not None:
+                    remote_iface = cached
+                else:
+                    remote_iface = self.api.dcim.interfaces.get(remote_iface.id)
+                    if not remote_iface:
+                        return None
+                    self._remote_iface_cache[remote_iface.id] = remote_iface
 
             # Get the remote device (switch)
             remote_device = remote_iface.device
@@ -251,11 +341,24 @@ class NetBoxClient:
         Returns:
             List of switch information dicts with name and management IP.
         """
-        selector = self.settings.parse_selector(self.settings.switches_selector)
+        # Switch inventory changes on human timescales; with
+        # SWITCHES_CACHE_TTL set, reuse the previous fetch within the window
+        ttl = self.settings.switches_cache_ttl
+        if (
+            ttl > 0
+            and self._switches_cache is not None
+            and time.monotonic() - self._switches_cache_at < ttl
+        ):
+            logger.debug("Using cached switch inventory", switches=len(self._switches_cache))
+            return self._switches_cache
+
+        selector = self.settings.get_switches_filter()
         logger.info("Fetching switches from NetBox", selector=selector)
 
         switches = []
-        devices = list(self.api.dcim.devices.filter(**selector))
+        devices = list(
+            self.api.dcim.devices.filter(exclude="config_context", **selector)
+        )
 
         for device in devices:
             # Get primary IP for SNMP queries
@@ -281,6 +384,8 @@ class NetBoxClient:
             )
 
         logger.info(f"Found {len(switches)} switches with primary IP")
+        self._switches_cache = switches
+        self._switches_cache_at = time.monotonic()
         return switches
 
     # --- Tag Management ---
@@ -299,9 +404,14 @@ class NetBoxClient:
         if tag_slug is None:
             tag_slug = tag_name.lower().replace(" ", "-")
 
+        cached = self._tag_id_cache.get(tag_slug)
+        if cached is not None:
+            return cached
+
         # Try to get existing tag
         existing = self.api.extras.tags.get(slug=tag_slug)
         if existing:
+            self._tag_id_cache[tag_slug] = existing.id
             return existing.id
 
         # Create new tag
@@ -312,6 +422,7 @@ class NetBoxClient:
             color="f44336",  # Red color for alert tag
             description="Auto-created by IPMI Move Auditor - indicates IPMI MAC moved",
         )
+        self._tag_id_cache[tag_slug] = tag.id
         return tag.id
 
     def add_tag_to_device(self, device_id: int, tag_name: str) -> bool:
@@ -341,7 +452,7 @@ class NetBoxClient:
 
             # Check if tag already present
             if tag_id in current_tag_ids:
-                logger.debug(f"Tag already present", device=device.name, tag=tag_name)
+                logger.debug("Tag already present", device=device.name, tag=tag_name)
                 return True
 
             # Add tag by ID
@@ -356,6 +467,90 @@ class NetBoxClient:
             logger.error(f"Failed to add tag", device_id=device_id, tag=tag_name, error=str(e))
             return False
 
+    def bulk_update_tags(
+        self,
+        add_device_ids: set[int],
+        remove_device_ids: set[int],
+        tag_name: str,
+    ) -> bool:
+        """
+        Add/remove a tag on many devices with one fetch and one bulk PATCH.
+
+        Replaces one HTTP round trip per device with a single id__in fetch
+        plus a single bulk update for the devices that actually change.
+
+        Args:
+            add_device_ids: Device IDs that should carry the tag
+            remove_device_ids: Device IDs that should not carry the tag
+            tag_name: Name of the tag to add/remove
+
+        Returns:
+            True if all updates were applied (or nothing needed changing)
+        """
+        if not add_device_ids and not remove_device_ids:
+            return True
+
+        try:
+            tag_slug = tag_name.lower().replace(" ", "-")
+            tag_id = self._ensure_tag_exists(tag_name, tag_slug) if add_device_ids else None
+
+            # In steady state nearly every OK device is untagged; one
+            # tag-filtered query finds the devices actually carrying the tag
+            # so the id__in fetch below only covers real changes. The tag
+            # may not exist yet (it's only created on the first add, and
+            # NetBox rejects a filter on an unknown tag slug with a 400),
+            # in which case nothing can be carrying it.
+            if remove_device_ids:
+                if tag_slug not in self._tag_id_cache:
+                    existing = self.api.extras.tags.get(slug=tag_slug)
+                    if existing:
+                        self._tag_id_cache[tag_slug] = existing.id
+                if tag_slug in self._tag_id_cache:
+                    tagged_ids = {
+                        d.id for d in self.api.dcim.devices.filter(tag=tag_slug)
+                    }
+                    remove_device_ids = remove_device_ids & tagged_ids
+                else:
+                    remove_device_ids = set()
+
+            if not add_device_ids and not remove_device_ids:
+                return True
+
+            all_ids = list(add_device_ids | remove_device_ids)
+            devices = list(self.api.dcim.devices.filter(id__in=all_ids))
+
+            patches = []
+            for device in devices:
+                current_tags = {t.slug: t.id for t in device.tags} if device.tags else {}
+
+                if device.id in add_device_ids and tag_slug not in current_tags:
+                    patches.append(
+                        {"id": device.id, "tags": [*current_tags.values(), tag_id]}
+                    )
+                elif device.id in remove_device_ids and tag_slug in current_tags:
+                    patches.append(
+                        {
+                            "id": device.id,
+                            "tags": [
+                                tid for slug, tid in current_tags.items() if slug != tag_slug
+                            ],
+                        }
+                    )
+
+            if patches:
+                self.api.dcim.devices.update(patches)
+                logger.info(
+                    f"Bulk updated tag on {len(patches)} devices",
+                    tag=tag_name,
+                    added=len(add_device_ids),
+                    removed=len(remove_device_ids),
+                )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed bulk tag update", tag=tag_name, error=str(e))
+            return False
+
     def remove_tag_from_device(self, device_id: int, tag_name: str) -> bool:
         """
         Remove a tag from a device.
@@ -9,15 +9,45 @@ from .models import AlertInfo
 
 logger = get_logger(__name__)
 
+# Journal entry body, built once at import; _format_journal_entry fills it
+# with a single format_map instead of assembling ~13 f-strings per alert
+_JOURNAL_TMPL = (
+    "**{prefix}IPMI Move Detected**\n"
+    "\n"
+    "| Field | Value |\n"
+    "|:------|:------|\n"
+    "| IPMI MAC | `{mac}` |\n"
+    "| IPMI IP | {ip} |\n"
+    "| Expected (NetBox) | {expected_switch}:{expected_port} |\n"
+    "| Observed (FDB) | {observed_switch}:{observed_port} |\n"
+    "{vlan_line}"
+    "| Consecutive Observations | {count} |\n"
+    "| First Detected | {first_detected} |\n"
+    "\n"
+    "---\n"
+    "_Detected by NetBox IPMI Move Auditor_"
+)
+
 
 class NetBoxNotifier:
     """Sends notifications to NetBox Journal Entries."""
 
-    def __init__(self, settings: Settings | None = None):
-        """Initialize notifier."""
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        session: requests.Session | None = None,
+    ):
+        """Initialize notifier.
+
+        Args:
+            settings: Application settings
+            session: Optional shared requests session (keep-alive); a
+                private one is created when not provided
+        """
         self.settings = settings or get_settings()
         self._base_url = self.settings.netbox_url.rstrip("/")
         self._token = self.settings.netbox_token
+        self._session = session or requests.Session()
 
     def _get_headers(self) -> dict[str, str]:
         """Get authorization headers."""
@@ -28,34 +58,24 @@ class NetBoxNotifier:
 
     def _format_journal_entry(self, alert: AlertInfo) -> str:
         """Format alert as NetBox journal entry text."""
-        if alert.is_reminder:
-            prefix = "REMINDER: "
-        else:
-            prefix = ""
-
-        lines = [
-            f"**{prefix}IPMI Move Detected**",
-            "",
-            f"| Field | Value |",
-            f"|:------|:------|",
-            f"| IPMI MAC | `{alert.mac_address}` |",
-            f"| IPMI IP | {alert.ip_address or 'N/A'} |",
-            f"| Expected (NetBox) | {alert.expected_switch}:{alert.expected_port} |",
-            f"| Observed (FDB) | {alert.observed_switch}:{alert.observed_port} |",
-        ]
-
-        if alert.observed_vlan:
-            lines.append(f"| Observed VLAN | {alert.observed_vlan} |")
-
-        lines.extend([
-            f"| Consecutive Observations | {alert.consecutive_count} |",
-            f"| First Detected | {alert.first_detected.strftime('%Y-%m-%d %H:%M UTC')} |",
-            "",
-            "---",
-            "_Detected by NetBox IPMI Move Auditor_",
-        ])
-
-        return "\n".join(lines)
+        return _JOURNAL_TMPL.format_map(
+            {
+                "prefix": "REMINDER: " if alert.is_reminder else "",
+                "mac": alert.mac_address,
+                "ip": alert.ip_address or "N/A",
+                "expected_switch": alert.expected_switch,
+                "expected_port": alert.expected_port,
+                "observed_switch": alert.observed_switch,
+                "observed_port": alert.observed_port,
+                "vlan_line": (
+                    f"| Observed VLAN | {alert.observed_vlan} |\n"
+                    if alert.observed_vlan
+                    else ""
+                ),
+                "count": alert.consecutive_count,
+                "first_detected": alert.first_detected.strftime("%Y-%m-%d %H:%M UTC"),
+            }
+        )
 
     @retry(
         stop=stop_after_attempt(3),
@@ -86,7 +106,7 @@ class NetBoxNotifier:
             "comments": comments,
         }
 
-        response = requests.post(
+        response = self._session.post(
             url,
             json=payload,
             headers=self._get_headers(),
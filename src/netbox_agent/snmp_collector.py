@@ -1,6 +1,11 @@
 """SNMP FDB (MAC address table) collector."""
 
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import chain
 from typing import Any
 
 from pysnmp.hlapi import (
@@ -15,6 +20,14 @@ from pysnmp.hlapi import (
 )
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+try:
+    # Optional C-backed backend (net-snmp bindings): parses varbinds in C
+    # instead of pure Python, which matters at FDB-table scale
+    import easysnmp
+except ImportError:  # pragma: no cover - depends on net-snmp being installed
+    easysnmp = None
+
+from ._mac import normalize_mac
 from .config import Settings, get_settings
 from .logging import get_logger
 from .models import FdbEntry, SwitchFdb
@@ -36,6 +49,14 @@ IF_DESCR = "1.3.6.1.2.1.2.2.1.2"
 # Q-BRIDGE-MIB for VLAN-aware FDB (dot1qTpFdbPort)
 DOT1Q_TP_FDB_PORT = "1.3.6.1.2.1.17.7.1.2.2.1.2"
 
+# Decimal octet (0-255) -> two-digit hex, so MAC formatting in the FDB hot
+# loop is six table lookups instead of bytes()/hex()/join per entry
+_HEX = [f"{i:02x}" for i in range(256)]
+
+# Interface names and bridge-port mappings change on human timescales;
+# reuse them across poll cycles for this long before re-walking
+_IFACE_MAP_TTL = 3600.0
+
 
 class SnmpCollector:
     """Collects FDB entries from switches using SNMP."""
@@ -43,45 +64,121 @@ class SnmpCollector:
     def __init__(self, settings: Settings | None = None):
         """Initialize SNMP collector."""
         self.settings = settings or get_settings()
-        self._engine = SnmpEngine()
+        # SnmpEngine is not thread-safe; keep one per worker thread
+        self._local = threading.local()
+        self._backend = self._resolve_backend()
+        # ip -> (fetched_at, if_names, bridge_ports); entries are replaced
+        # atomically so concurrent workers at worst re-walk once
+        self._iface_maps_cache: dict[str, tuple[float, dict[int, str], dict[int, int]]] = {}
+        # Community data never varies and UdpTransportTarget resolves the
+        # address at construction; build each once instead of per walk.
+        # Each switch is handled by a single worker per cycle, so the
+        # cached targets are never used concurrently.
+        self._community = CommunityData(self.settings.snmp_community)
+        self._transport_cache: dict[str, UdpTransportTarget] = {}
+
+    def _resolve_backend(self) -> str:
+        """Pick the SNMP backend based on settings and availability."""
+        backend = self.settings.snmp_backend.lower()
+        if backend == "auto":
+            return "easysnmp" if easysnmp is not None else "pysnmp"
+        if backend == "easysnmp" and easysnmp is None:
+            logger.warning(
+                "easysnmp backend requested but not installed, falling back to pysnmp"
+            )
+            return "pysnmp"
+        return backend
+
+    def _get_engine(self) -> SnmpEngine:
+        """Get the SNMP engine for the current thread."""
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = SnmpEngine()
+            self._local.engine = engine
+        return engine
 
     def _normalize_mac(self, mac_bytes: bytes | str) -> str:
         """Normalize MAC address to lowercase with colons."""
-        if isinstance(mac_bytes, bytes):
-            mac = mac_bytes.hex()
-        else:
-            mac = str(mac_bytes).lower().replace("-", "").replace(":", "").replace(".", "")
-        return ":".join(mac[i : i + 2] for i in range(0, 12, 2))
+        return normalize_mac(mac_bytes)
 
     def _get_snmp_transport(self, ip: str) -> UdpTransportTarget:
-        """Create SNMP transport target."""
-        return UdpTransportTarget(
-            (ip, 161),
-            timeout=self.settings.snmp_timeout,
-            retries=self.settings.snmp_retries,
-        )
+        """Get the SNMP transport target for a switch (built once per IP)."""
+        target = self._transport_cache.get(ip)
+        if target is None:
+            target = UdpTransportTarget(
+                (ip, 161),
+                timeout=self.settings.snmp_timeout,
+                retries=self.settings.snmp_retries,
+            )
+            self._transport_cache[ip] = target
+        return target
 
     def _get_community(self) -> CommunityData:
         """Get SNMP community data."""
-        return CommunityData(self.settings.snmp_community)
+        return self._community
 
-    def _walk_oid(self, ip: str, oid: str) -> dict[str, Any]:
+    def _walk_oid(self, ip: str, oid: str) -> Iterator[tuple[tuple[int, ...], Any]]:
         """
-        Walk an SNMP OID tree and return results.
+        Walk an SNMP OID tree, streaming results.
 
-        Returns dict mapping OID suffix to value.
+        Yields (suffix, value) pairs where the suffix is the OID tail past
+        the walked subtree, parsed once into an int tuple so callers never
+        re-split or re-int() the dotted string. Streaming means a 50k-entry
+        FDB is processed row by row instead of being buffered twice.
         """
-        results = {}
+        if self._backend == "easysnmp":
+            return self._walk_oid_easysnmp(ip, oid)
+        return self._walk_oid_pysnmp(ip, oid)
+
+    def _walk_oid_dict(self, ip: str, oid: str) -> dict[tuple[int, ...], Any]:
+        """Materialized walk for callers that need random access by suffix."""
+        return dict(self._walk_oid(ip, oid))
+
+    def _walk_oid_easysnmp(self, ip: str, oid: str) -> Iterator[tuple[tuple[int, ...], Any]]:
+        """Walk an OID via net-snmp bulkwalk (C-backed varbind parsing)."""
+        session = easysnmp.Session(
+            hostname=ip,
+            community=self.settings.snmp_community,
+            version=2,
+            timeout=self.settings.snmp_timeout,
+            retries=self.settings.snmp_retries,
+            use_numeric=True,
+        )
+        try:
+            varbinds = session.bulkwalk(
+                oid,
+                non_repeaters=0,
+                max_repetitions=self.settings.snmp_max_repetitions,
+            )
+        except easysnmp.EasySNMPError as e:
+            logger.warning(f"SNMP error: {e}", ip=ip, oid=oid)
+            return
+
+        prefix = oid if oid.startswith(".") else "." + oid
+        for vb in varbinds:
+            # With use_numeric the OID comes back numeric; the suffix is
+            # everything past the walked subtree, same shape as pysnmp's
+            full = f"{vb.oid}.{vb.oid_index}" if vb.oid_index else vb.oid
+            if not full.startswith(prefix + "."):
+                continue
+            yield tuple(map(int, full[len(prefix) + 1 :].split("."))), vb.value
+
+    def _walk_oid_pysnmp(self, ip: str, oid: str) -> Iterator[tuple[tuple[int, ...], Any]]:
+        """Walk an OID via the pure-Python pysnmp hlapi."""
         transport = self._get_snmp_transport(ip)
         community = self._get_community()
+        # Compare/slice pre-parsed int tuples from the response OIDs rather
+        # than stringifying and re-splitting each varbind
+        base = tuple(int(x) for x in oid.split("."))
+        base_len = len(base)
 
         for error_indication, error_status, error_index, var_binds in bulkCmd(
-            self._engine,
+            self._get_engine(),
             community,
             transport,
             ContextData(),
             0,  # nonRepeaters
-            50,  # maxRepetitions
+            self.settings.snmp_max_repetitions,
             ObjectType(ObjectIdentity(oid)),
             lexicographicMode=False,
         ):
@@ -98,36 +195,22 @@ class SnmpCollector:
                 break
 
             for var_bind in var_binds:
-                oid_str = str(var_bind[0])
-                if not oid_str.startswith(oid):
+                oid_tuple = tuple(var_bind[0].getOid())
+                if oid_tuple[:base_len] != base:
                     continue
-                suffix = oid_str[len(oid) + 1 :]  # +1 for the dot
-                results[suffix] = var_bind[1]
-
-        return results
+                yield oid_tuple[base_len:], var_bind[1]
 
     def _get_interface_names(self, ip: str) -> dict[int, str]:
         """Get mapping of ifIndex to interface name."""
-        # Try ifName first (more reliable)
+        # Try ifName first (more reliable); suffixes arrive pre-parsed as
+        # single-element int tuples
         names = self._walk_oid(ip, IF_NAME)
-        result = {}
-
-        for suffix, value in names.items():
-            try:
-                if_index = int(suffix)
-                result[if_index] = str(value)
-            except (ValueError, TypeError):
-                continue
+        result = {suffix[0]: str(value) for suffix, value in names if suffix}
 
         # Fallback to ifDescr if ifName is empty
         if not result:
             descrs = self._walk_oid(ip, IF_DESCR)
-            for suffix, value in descrs.items():
-                try:
-                    if_index = int(suffix)
-                    result[if_index] = str(value)
-                except (ValueError, TypeError):
-                    continue
+            result = {suffix[0]: str(value) for suffix, value in descrs if suffix}
 
         return result
 
@@ -136,16 +219,27 @@ class SnmpCollector:
         mapping = self._walk_oid(ip, DOT1D_BASE_PORT_IF_INDEX)
         result = {}
 
-        for suffix, value in mapping.items():
+        for suffix, value in mapping:
             try:
-                bridge_port = int(suffix)
-                if_index = int(value)
-                result[bridge_port] = if_index
-            except (ValueError, TypeError):
+                result[suffix[0]] = int(value)
+            except (ValueError, TypeError, IndexError):
                 continue
 
         return result
 
+    def _get_iface_maps(self, ip: str) -> tuple[dict[int, str], dict[int, int]]:
+        """Get (ifIndex -> name, bridge port -> ifIndex) maps, cached per switch."""
+        cached = self._iface_maps_cache.get(ip)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < _IFACE_MAP_TTL:
+            return cached[1], cached[2]
+
+        if_names = self._get_interface_names(ip)
+        bridge_ports = self._get_bridge_port_mapping(ip)
+        if if_names or bridge_ports:
+            self._iface_maps_cache[ip] = (now, if_names, bridge_ports)
+        return if_names, bridge_ports
+
     @retry(
         stop=stop_after_attempt(2),
         wait=wait_exponential(multiplier=1, min=2, max=5),
@@ -161,30 +255,40 @@ class SnmpCollector:
         Returns:
             SwitchFdb with collected entries or error
         """
-        logger.debug(f"Collecting FDB from {switch_name}", ip=switch_ip)
+        logger.debug("Collecting FDB", switch=switch_name, ip=switch_ip)
 
         try:
-            # Get interface names and bridge port mapping
-            if_names = self._get_interface_names(switch_ip)
-            bridge_ports = self._get_bridge_port_mapping(switch_ip)
-
             entries: list[FdbEntry] = []
 
-            # Try Q-BRIDGE-MIB first (VLAN-aware)
-            qbridge_fdb = self._walk_oid(switch_ip, DOT1Q_TP_FDB_PORT)
-
-            if qbridge_fdb:
-                # Q-BRIDGE format: VLAN.MAC -> port
-                for suffix, port_value in qbridge_fdb.items():
-                    try:
-                        parts = suffix.split(".")
-                        if len(parts) < 7:
+            # Walk the FDB first (Q-BRIDGE, then BRIDGE-MIB): the walks are
+            # streamed, so peek one row to learn whether anything is there
+            # before fetching the interface-name and bridge-port maps
+            qbridge_iter = self._walk_oid(switch_ip, DOT1Q_TP_FDB_PORT)
+            qbridge_first = next(qbridge_iter, None)
+            fdb_ports_iter: Iterator[tuple[tuple[int, ...], Any]] = iter(())
+            fdb_ports_first = None
+            if qbridge_first is None:
+                fdb_ports_iter = self._walk_oid(switch_ip, DOT1D_TP_FDB_PORT)
+                fdb_ports_first = next(fdb_ports_iter, None)
+
+            if qbridge_first is not None or fdb_ports_first is not None:
+                if_names, bridge_ports = self._get_iface_maps(switch_ip)
+
+            if qbridge_first is not None:
+                # Q-BRIDGE format: VLAN.MAC -> port; the suffix tuple is
+                # already (vlan, octet1..octet6) as ints, so nothing in the
+                # loop can raise on well-formed data - the guard sits
+                # outside rather than paying exception setup per row
+                try:
+                    for suffix, port_value in chain([qbridge_first], qbridge_iter):
+                        if len(suffix) < 7:
                             continue
 
-                        vlan = int(parts[0])
-                        mac_parts = parts[1:7]
-                        mac_addr = self._normalize_mac(
-                            bytes([int(x) for x in mac_parts])
+                        vlan = suffix[0]
+                        m = suffix[1:7]
+                        mac_addr = (
+                            f"{_HEX[m[0]]}:{_HEX[m[1]]}:{_HEX[m[2]]}:"
+                            f"{_HEX[m[3]]}:{_HEX[m[4]]}:{_HEX[m[5]]}"
                         )
 
                         bridge_port = int(port_value)
@@ -198,16 +302,20 @@ class SnmpCollector:
                                 vlan=vlan,
                             )
                         )
-                    except (ValueError, TypeError, IndexError) as e:
-                        logger.debug(f"Error parsing Q-BRIDGE entry: {e}")
-                        continue
-            else:
-                # Fallback to BRIDGE-MIB (non-VLAN-aware)
-                fdb_ports = self._walk_oid(switch_ip, DOT1D_TP_FDB_PORT)
-                fdb_macs = self._walk_oid(switch_ip, DOT1D_TP_FDB_ADDRESS)
-
-                for suffix, port_value in fdb_ports.items():
-                    try:
+                except (ValueError, TypeError, IndexError) as e:
+                    logger.warning(
+                        "Aborting Q-BRIDGE parse on malformed entry",
+                        switch=switch_name,
+                        error=str(e),
+                        parsed=len(entries),
+                    )
+            elif fdb_ports_first is not None:
+                # Fallback to BRIDGE-MIB (non-VLAN-aware); the int-tuple
+                # suffixes are hashable, so the address walk keys a dict
+                fdb_macs = self._walk_oid_dict(switch_ip, DOT1D_TP_FDB_ADDRESS)
+
+                try:
+                    for suffix, port_value in chain([fdb_ports_first], fdb_ports_iter):
                         # Get MAC address for this entry
                         mac_raw = fdb_macs.get(suffix)
                         if not mac_raw:
@@ -219,6 +327,9 @@ class SnmpCollector:
                             if mac_hex.startswith("0x"):
                                 mac_hex = mac_hex[2:]
                             mac_addr = self._normalize_mac(mac_hex)
+                        elif isinstance(mac_raw, str):
+                            # easysnmp hands OCTET STRINGs back as latin-1 str
+                            mac_addr = self._normalize_mac(mac_raw.encode("latin-1"))
                         else:
                             mac_addr = self._normalize_mac(bytes(mac_raw))
 
@@ -233,9 +344,13 @@ class SnmpCollector:
                                 vlan=None,
                             )
                         )
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Error parsing BRIDGE-MIB entry: {e}")
-                        continue
+                except (ValueError, TypeError) as e:
+                    logger.warning(
+                        "Aborting BRIDGE-MIB parse on malformed entry",
+                        switch=switch_name,
+                        error=str(e),
+                        parsed=len(entries),
+                    )
 
             logger.info(
                 f"Collected {len(entries)} FDB entries from {switch_name}",
@@ -263,7 +378,11 @@ class SnmpCollector:
 
     def collect_all(self, switches: list[dict[str, Any]]) -> dict[str, SwitchFdb]:
         """
-        Collect FDB from all switches.
+        Collect FDB from all switches in parallel.
+
+        Each switch is independent network I/O, so polling runs on a thread
+        pool (bounded by snmp_workers) and total time approaches the slowest
+        switch instead of the sum of all walks.
 
         Args:
             switches: List of switch dicts with 'name' and 'ip' keys
@@ -271,8 +390,33 @@ class SnmpCollector:
         Returns:
             Dict mapping switch name to SwitchFdb
         """
-        results = {}
-        for switch in switches:
-            fdb = self.collect_fdb(switch["name"], switch["ip"])
-            results[switch["name"]] = fdb
+        results: dict[str, SwitchFdb] = {}
+        if not switches:
+            return results
+
+        max_workers = min(self.settings.snmp_workers, len(switches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.collect_fdb, switch["name"], switch["ip"]): switch["name"]
+                for switch in switches
+            }
+            for future in as_completed(futures):
+                switch_name = futures[future]
+                try:
+                    results[switch_name] = future.result()
+                except Exception as e:
+                    # collect_fdb handles its own errors; this guards the retry
+                    # wrapper giving up entirely
+                    logger.error(
+                        f"FDB collection failed for {switch_name}",
+                        switch=switch_name,
+                        error=str(e),
+                    )
+                    results[switch_name] = SwitchFdb(
+                        switch_name=switch_name,
+                        entries=[],
+                        collected_at=datetime.utcnow(),
+                        error=str(e),
+                    )
+
         return results
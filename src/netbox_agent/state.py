@@ -3,8 +3,10 @@
 import hashlib
 import json
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Generator
 
@@ -19,31 +21,158 @@ SCHEMA = """
 CREATE TABLE IF NOT EXISTS mac_state (
     mac_address TEXT PRIMARY KEY,
     server_name TEXT NOT NULL,
-    last_ok_seen_at TEXT,
+    last_ok_seen_at INTEGER,
     last_observed_switch TEXT,
     last_observed_port TEXT,
     last_observed_vlan INTEGER,
     move_counter INTEGER DEFAULT 0,
-    first_move_seen_at TEXT,
-    last_move_seen_at TEXT,
-    updated_at TEXT NOT NULL
+    first_move_seen_at INTEGER,
+    last_move_seen_at INTEGER,
+    updated_at INTEGER NOT NULL
 );
 
 CREATE TABLE IF NOT EXISTS alert_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     mac_address TEXT NOT NULL,
-    alert_hash TEXT NOT NULL,
-    sent_at TEXT NOT NULL,
+    alert_hash INTEGER NOT NULL,
+    sent_at INTEGER NOT NULL,
     observed_switch TEXT,
     observed_port TEXT,
     is_reminder INTEGER DEFAULT 0
 );
 
-CREATE INDEX IF NOT EXISTS idx_mac_state_mac ON mac_state(mac_address);
-CREATE INDEX IF NOT EXISTS idx_alert_history_mac ON alert_history(mac_address);
-CREATE INDEX IF NOT EXISTS idx_alert_history_hash ON alert_history(alert_hash);
+-- mac_address is the primary key, so the old full-table index on it was
+-- pure overhead; what reporting queries actually want is the handful of
+-- rows currently moving, which the partial index keeps small and hot
+DROP INDEX IF EXISTS idx_mac_state_mac;
+CREATE INDEX IF NOT EXISTS idx_mac_state_moving
+    ON mac_state(mac_address) WHERE move_counter > 0;
+
+-- One covering index serves the dedup lookup (equality on mac+hash,
+-- newest-first on sent_at, is_reminder read from the index) without a
+-- sort; the old single-column indexes it replaces are dropped on upgrade
+DROP INDEX IF EXISTS idx_alert_history_mac;
+DROP INDEX IF EXISTS idx_alert_history_hash;
+CREATE INDEX IF NOT EXISTS idx_alert_history_lookup
+    ON alert_history(mac_address, alert_hash, sent_at DESC, is_reminder);
 """
 
+# Bumped for the TEXT -> INTEGER timestamp migration; stored in
+# PRAGMA user_version so _ensure_db can recognize pre-migration files
+_SCHEMA_VERSION = 2
+
+# Hot-path SQL hoisted to module constants: sqlite3 caches prepared
+# statements by query text, so reusing the same interned strings lets the
+# VDBE programs be reused instead of re-parsed per call
+_SQL_UPSERT_OK = """
+INSERT INTO mac_state
+(mac_address, server_name, last_ok_seen_at, move_counter, updated_at)
+VALUES (?, ?, ?, 0, ?)
+ON CONFLICT(mac_address) DO UPDATE SET
+    last_ok_seen_at = excluded.last_ok_seen_at,
+    move_counter = 0,
+    first_move_seen_at = NULL,
+    last_move_seen_at = NULL,
+    updated_at = excluded.updated_at
+"""
+
+_SQL_UPSERT_MOVE = """
+INSERT INTO mac_state
+(mac_address, server_name, last_observed_switch, last_observed_port,
+ last_observed_vlan, move_counter, first_move_seen_at,
+ last_move_seen_at, updated_at)
+VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
+ON CONFLICT(mac_address) DO UPDATE SET
+    move_counter = CASE
+        WHEN mac_state.last_observed_switch IS excluded.last_observed_switch
+             AND mac_state.last_observed_port IS excluded.last_observed_port
+        THEN mac_state.move_counter + 1
+        ELSE 1
+    END,
+    first_move_seen_at = CASE
+        WHEN mac_state.last_observed_switch IS excluded.last_observed_switch
+             AND mac_state.last_observed_port IS excluded.last_observed_port
+        THEN mac_state.first_move_seen_at
+        ELSE excluded.first_move_seen_at
+    END,
+    last_observed_switch = excluded.last_observed_switch,
+    last_observed_port = excluded.last_observed_port,
+    last_observed_vlan = excluded.last_observed_vlan,
+    last_move_seen_at = excluded.last_move_seen_at,
+    updated_at = excluded.updated_at
+"""
+
+_SQL_UPSERT_MOVE_RETURNING = _SQL_UPSERT_MOVE + "RETURNING move_counter"
+
+_SQL_GET_COUNTER = "SELECT move_counter FROM mac_state WHERE mac_address = ?"
+
+_SQL_GET_FIRST_MOVE = "SELECT first_move_seen_at FROM mac_state WHERE mac_address = ?"
+
+_SQL_SELECT_LAST_ALERT = """
+SELECT sent_at, is_reminder FROM alert_history
+WHERE mac_address = ? AND alert_hash = ?
+ORDER BY sent_at DESC
+LIMIT 1
+"""
+
+_SQL_INSERT_ALERT = """
+INSERT INTO alert_history
+(mac_address, alert_hash, sent_at, observed_switch, observed_port, is_reminder)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_CLEANUP_ALERTS = "DELETE FROM alert_history WHERE sent_at < ?"
+
+# Dedup check and insert fused into one statement: the WHERE NOT EXISTS
+# guard skips the insert inside the dedup window, and is_reminder is
+# derived in-engine from whether the situation was ever alerted before
+_SQL_TRY_INSERT_ALERT = """
+INSERT INTO alert_history
+(mac_address, alert_hash, sent_at, observed_switch, observed_port, is_reminder)
+SELECT ?, ?, ?, ?, ?,
+       EXISTS (
+           SELECT 1 FROM alert_history
+           WHERE mac_address = ? AND alert_hash = ?
+       )
+WHERE NOT EXISTS (
+    SELECT 1 FROM alert_history
+    WHERE mac_address = ? AND alert_hash = ? AND sent_at > ?
+)
+RETURNING is_reminder
+"""
+
+
+def _now_us() -> int:
+    """Current time as integer epoch microseconds.
+
+    Timestamps are stored as integers: 8-byte b-tree keys compared in one
+    opcode, no isoformat/fromisoformat round trips on the hot paths.
+    time_ns avoids the float detour (and its precision loss) of time.time.
+    """
+    return time.time_ns() // 1_000
+
+
+def _us_to_datetime(us: int) -> datetime:
+    """Convert stored epoch microseconds back to a naive UTC datetime."""
+    return datetime.utcfromtimestamp(us / 1_000_000)
+
+
+@contextmanager
+def _txn(conn: sqlite3.Connection) -> Generator[None, None, None]:
+    """Explicit write transaction: BEGIN IMMEDIATE / COMMIT with rollback.
+
+    The connection runs in autocommit (isolation_level=None); taking the
+    write lock up front avoids lock-upgrade retries under WAL and keeps
+    transaction boundaries visible in the code instead of in driver state.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
 
 class StateManager:
     """Manages persistent state for move detection and alert deduplication."""
@@ -51,25 +180,89 @@ class StateManager:
     def __init__(self, settings: Settings | None = None):
         """Initialize state manager."""
         self.settings = settings or get_settings()
-        self._db_path = Path(self.settings.state_db_path)
+        self._db_path_str = str(Path(self.settings.state_db_path))
+        # One long-lived connection: connect/close per call dominates the
+        # cost of the short queries this class runs. The lock serializes
+        # access since sqlite3 connections aren't safe for concurrent use.
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        # Read caches for the hot lookups; writes through update_state /
+        # update_states keep them coherent (nothing else mutates mac_state)
+        self._counter_cache: dict[str, int] = {}
+        self._first_move_cache: dict[str, datetime | None] = {}
+        # Settings are frozen, so the dedup window can be resolved to
+        # microseconds once instead of re-deriving it per alert check
+        self._remind_after_us = int(
+            self.settings.get_remind_after_timedelta().total_seconds() * 1_000_000
+        )
         self._ensure_db()
 
     def _ensure_db(self) -> None:
-        """Ensure database and schema exist."""
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._get_connection() as conn:
-            conn.executescript(SCHEMA)
-            conn.commit()
+        """Open the database connection and ensure the schema exists."""
+        path = Path(self._db_path_str)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_new_db = path.name == ":memory:" or not path.exists() or path.stat().st_size == 0
+        # cached_statements above the default 128 keeps every hot statement's
+        # compiled VDBE program resident alongside the module-level SQL
+        # constants, so repeat executes skip the parser entirely
+        conn = sqlite3.connect(
+            self._db_path_str,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        # Incremental autovacuum keeps the file size bounded as old alert
+        # rows are deleted; the mode only takes effect if set before the
+        # first table is created, so it applies to fresh databases only
+        if is_new_db:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # Per-connection tuning (these, unlike journal_mode, don't persist):
+        # NORMAL sync is safe under WAL, temp structures stay in memory, and
+        # a larger page cache plus mmap keeps hot b-tree pages off syscalls
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if not is_new_db and schema_version < _SCHEMA_VERSION:
+            # Databases from before the integer-timestamp migration hold
+            # ISO strings in what are now INTEGER columns, which breaks
+            # every timestamp comparison. The state is disposable (it
+            # rebuilds within a few poll cycles), so drop and recreate
+            # rather than converting rows in place.
+            row = conn.execute(
+                "SELECT type FROM pragma_table_info('mac_state') "
+                "WHERE name = 'updated_at'"
+            ).fetchone()
+            if row is not None and row["type"].upper() == "TEXT":
+                logger.warning(
+                    "Dropping pre-migration state tables with TEXT timestamps"
+                )
+                conn.execute("DROP TABLE IF EXISTS mac_state")
+                conn.execute("DROP TABLE IF EXISTS alert_history")
+        conn.executescript(SCHEMA)
+        if schema_version != _SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        conn.execute("ANALYZE")
+        # WAL is sticky on the file: writers stop blocking readers and
+        # each commit costs one fsync instead of two
+        if path.name != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        self._conn = conn
 
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Get database connection context manager."""
-        conn = sqlite3.connect(str(self._db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Get the shared database connection, serialized by the lock."""
+        with self._lock:
+            yield self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def update_state(self, event: MoveEvent) -> int:
         """
@@ -79,43 +272,22 @@ class StateManager:
         """
         mac = event.server.mac
         server_name = event.server.server_name
-        now = datetime.utcnow().isoformat()
+        now = _now_us()
+
+        if event.status == MoveStatus.SUSPECT_UPLINK:
+            # Don't count uplink observations
+            return 0
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Get current state
-            cursor.execute(
-                "SELECT * FROM mac_state WHERE mac_address = ?",
-                (mac,),
-            )
-            row = cursor.fetchone()
-
             if event.status == MoveStatus.OK or event.status == MoveStatus.OK_MLAG_PEER:
-                # MAC is in correct location - reset counter
-                if row:
-                    cursor.execute(
-                        """
-                        UPDATE mac_state
-                        SET last_ok_seen_at = ?,
-                            move_counter = 0,
-                            first_move_seen_at = NULL,
-                            last_move_seen_at = NULL,
-                            updated_at = ?
-                        WHERE mac_address = ?
-                        """,
-                        (now, now, mac),
-                    )
-                else:
-                    cursor.execute(
-                        """
-                        INSERT INTO mac_state
-                        (mac_address, server_name, last_ok_seen_at, move_counter, updated_at)
-                        VALUES (?, ?, ?, 0, ?)
-                        """,
-                        (mac, server_name, now, now),
-                    )
-                conn.commit()
+                # MAC is in correct location - reset counter. One UPSERT
+                # replaces the SELECT-then-UPDATE/INSERT pair.
+                with _txn(conn):
+                    cursor.execute(_SQL_UPSERT_OK, (mac, server_name, now, now))
+                self._counter_cache[mac] = 0
+                self._first_move_cache[mac] = None
                 return 0
 
             elif event.status in (MoveStatus.MOVE_DETECTED, MoveStatus.MOVE_CONFIRMED):
@@ -124,63 +296,13 @@ class StateManager:
                 observed_port = observed.port_name if observed else None
                 observed_vlan = observed.vlan if observed else None
 
-                if row:
-                    # Check if observed endpoint changed
-                    prev_switch = row["last_observed_switch"]
-                    prev_port = row["last_observed_port"]
-
-                    if (
-                        prev_switch == observed_switch
-                        and prev_port == observed_port
-                    ):
-                        # Same endpoint - increment counter
-                        new_counter = row["move_counter"] + 1
-                        cursor.execute(
-                            """
-                            UPDATE mac_state
-                            SET move_counter = ?,
-                                last_move_seen_at = ?,
-                                updated_at = ?
-                            WHERE mac_address = ?
-                            """,
-                            (new_counter, now, now, mac),
-                        )
-                    else:
-                        # Different endpoint - reset counter to 1
-                        new_counter = 1
-                        cursor.execute(
-                            """
-                            UPDATE mac_state
-                            SET last_observed_switch = ?,
-                                last_observed_port = ?,
-                                last_observed_vlan = ?,
-                                move_counter = 1,
-                                first_move_seen_at = ?,
-                                last_move_seen_at = ?,
-                                updated_at = ?
-                            WHERE mac_address = ?
-                            """,
-                            (
-                                observed_switch,
-                                observed_port,
-                                observed_vlan,
-                                now,
-                                now,
-                                now,
-                                mac,
-                            ),
-                        )
-                else:
-                    # New entry
-                    new_counter = 1
+                # Same endpoint increments the counter, a new endpoint
+                # resets it to 1 and restamps first_move_seen_at; the IS
+                # comparisons keep NULL endpoints well-defined. RETURNING
+                # hands back the counter without a second query.
+                with _txn(conn):
                     cursor.execute(
-                        """
-                        INSERT INTO mac_state
-                        (mac_address, server_name, last_observed_switch, last_observed_port,
-                         last_observed_vlan, move_counter, first_move_seen_at,
-                         last_move_seen_at, updated_at)
-                        VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
-                        """,
+                        _SQL_UPSERT_MOVE_RETURNING,
                         (
                             mac,
                             server_name,
@@ -192,53 +314,153 @@ class StateManager:
                             now,
                         ),
                     )
+                    new_counter = cursor.fetchone()["move_counter"]
+                self._counter_cache[mac] = new_counter
+                # first_move_seen_at may or may not have been restamped;
+                # drop the cached value and re-read lazily
+                self._first_move_cache.pop(mac, None)
+                return new_counter
 
-                conn.commit()
-                return new_counter if "new_counter" in dir() else 1
+            else:  # NOT_FOUND
+                # Don't change counter when MAC not found
+                cursor.execute(_SQL_GET_COUNTER, (mac,))
+                row = cursor.fetchone()
+                return row["move_counter"] if row else 0
 
-            elif event.status == MoveStatus.SUSPECT_UPLINK:
-                # Don't count uplink observations
-                return 0
+    def update_states(self, events: list[MoveEvent]) -> dict[str, int]:
+        """
+        Update state for a whole poll cycle in one transaction.
 
+        Partitions events by status and applies the same UPSERTs as
+        update_state via executemany, so the cycle costs one write
+        transaction (one fsync) instead of one per event.
+
+        Returns a dict mapping MAC address to its new move counter.
+        """
+        now = _now_us()
+        counters: dict[str, int] = {}
+        ok_rows: list[tuple] = []
+        move_rows: list[tuple] = []
+        move_macs: list[str] = []
+        lookup_macs: list[str] = []
+        suspect_macs: set[str] = set()
+
+        for event in events:
+            mac = event.server.mac
+            if event.status == MoveStatus.OK or event.status == MoveStatus.OK_MLAG_PEER:
+                ok_rows.append((mac, event.server.server_name, now, now))
+                counters[mac] = 0
+            elif event.status in (MoveStatus.MOVE_DETECTED, MoveStatus.MOVE_CONFIRMED):
+                observed = event.observed
+                move_rows.append(
+                    (
+                        mac,
+                        event.server.server_name,
+                        observed.switch_name if observed else None,
+                        observed.port_name if observed else None,
+                        observed.vlan if observed else None,
+                        now,
+                        now,
+                        now,
+                    )
+                )
+                move_macs.append(mac)
+            elif event.status == MoveStatus.SUSPECT_UPLINK:
+                counters[mac] = 0
+                suspect_macs.add(mac)
             else:  # NOT_FOUND
-                # Don't change counter when MAC not found
-                if row:
-                    return row["move_counter"]
-                return 0
+                lookup_macs.append(mac)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            if ok_rows or move_rows:
+                with _txn(conn):
+                    if ok_rows:
+                        cursor.executemany(_SQL_UPSERT_OK, ok_rows)
+                    if move_rows:
+                        cursor.executemany(_SQL_UPSERT_MOVE, move_rows)
+
+            # executemany can't RETURNING: fetch the fresh counters for the
+            # move and not-found MACs in one IN query
+            wanted = move_macs + lookup_macs
+            if wanted:
+                placeholders = ",".join("?" * len(wanted))
+                cursor.execute(
+                    f"SELECT mac_address, move_counter FROM mac_state "
+                    f"WHERE mac_address IN ({placeholders})",
+                    wanted,
+                )
+                found = {row["mac_address"]: row["move_counter"] for row in cursor}
+                for mac in wanted:
+                    counters[mac] = found.get(mac, 0)
+
+        # Keep the read caches coherent with what was just written. SUSPECT
+        # events wrote nothing: their 0 is a return value only (mirroring
+        # update_state) and must not shadow the counter the DB still holds.
+        for mac in move_macs:
+            self._first_move_cache.pop(mac, None)
+        for row in ok_rows:
+            self._first_move_cache[row[0]] = None
+        self._counter_cache.update(
+            (mac, counter)
+            for mac, counter in counters.items()
+            if mac not in suspect_macs
+        )
+
+        return counters
 
     def get_move_counter(self, mac: str) -> int:
-        """Get current move counter for a MAC."""
+        """Get current move counter for a MAC (cached after first read)."""
+        cached = self._counter_cache.get(mac)
+        if cached is not None:
+            return cached
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT move_counter FROM mac_state WHERE mac_address = ?",
-                (mac,),
-            )
+            cursor.execute(_SQL_GET_COUNTER, (mac,))
             row = cursor.fetchone()
-            return row["move_counter"] if row else 0
+            counter = row["move_counter"] if row else 0
+
+        self._counter_cache[mac] = counter
+        return counter
 
     def get_first_move_time(self, mac: str) -> datetime | None:
-        """Get the timestamp of first move detection."""
+        """Get the timestamp of first move detection (cached after first read)."""
+        if mac in self._first_move_cache:
+            return self._first_move_cache[mac]
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT first_move_seen_at FROM mac_state WHERE mac_address = ?",
-                (mac,),
-            )
+            cursor.execute(_SQL_GET_FIRST_MOVE, (mac,))
             row = cursor.fetchone()
+            first_seen = None
             if row and row["first_move_seen_at"]:
-                return datetime.fromisoformat(row["first_move_seen_at"])
-            return None
+                first_seen = _us_to_datetime(row["first_move_seen_at"])
+
+        self._first_move_cache[mac] = first_seen
+        return first_seen
 
     def _compute_alert_hash(
         self,
         mac: str,
         observed_switch: str | None,
         observed_port: str | None,
-    ) -> str:
+    ) -> int:
         """Compute hash for alert deduplication."""
-        data = f"{mac}:{observed_switch}:{observed_port}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        # One joined bytes object fed straight to blake2s: no intermediate
+        # f-string or str.encode of the whole key. The native 8-byte digest
+        # is packed into an int64 so the alert_hash index stores 8-byte
+        # integer keys compared in a single opcode.
+        data = b":".join(
+            (
+                mac.encode(),
+                (observed_switch or "").encode(),
+                (observed_port or "").encode(),
+            )
+        )
+        digest = hashlib.blake2s(data, digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
 
     def should_send_alert(
         self,
@@ -254,35 +476,122 @@ class StateManager:
         observed_switch = observed.switch_name if observed else None
         observed_port = observed.port_name if observed else None
         alert_hash = self._compute_alert_hash(mac, observed_switch, observed_port)
-        remind_after = self.settings.get_remind_after_timedelta()
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT sent_at, is_reminder FROM alert_history
-                WHERE mac_address = ? AND alert_hash = ?
-                ORDER BY sent_at DESC
-                LIMIT 1
-                """,
-                (mac, alert_hash),
-            )
+            cursor.execute(_SQL_SELECT_LAST_ALERT, (mac, alert_hash))
             row = cursor.fetchone()
 
             if not row:
                 # No previous alert for this situation
                 return (True, False)
 
-            last_sent = datetime.fromisoformat(row["sent_at"])
-            now = datetime.utcnow()
-
-            if now - last_sent > remind_after:
+            if _now_us() - row["sent_at"] > self._remind_after_us:
                 # Enough time has passed - send reminder
                 return (True, True)
 
             # Too soon to send another alert
             return (False, False)
 
+    def should_send_alerts(
+        self,
+        items: list[tuple[str, ObservedEndpoint | None]],
+    ) -> list[tuple[bool, bool]]:
+        """
+        Batched variant of should_send_alert.
+
+        Hashes every (mac, observed) pair up front and resolves the last
+        sent time for all of them with one row-value IN query, so a poll
+        cycle's worth of dedup checks costs a single round trip.
+
+        Returns:
+            List of (should_send, is_reminder), aligned with ``items``.
+        """
+        if not items:
+            return []
+
+        keys = [
+            (
+                mac,
+                self._compute_alert_hash(
+                    mac,
+                    observed.switch_name if observed else None,
+                    observed.port_name if observed else None,
+                ),
+            )
+            for mac, observed in items
+        ]
+
+        values = ", ".join(["(?, ?)"] * len(keys))
+        params = [field for key in keys for field in key]
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT mac_address, alert_hash, MAX(sent_at) AS sent_at "
+                "FROM alert_history "
+                f"WHERE (mac_address, alert_hash) IN (VALUES {values}) "
+                "GROUP BY mac_address, alert_hash",
+                params,
+            )
+            last_sent = {
+                (row["mac_address"], row["alert_hash"]): row["sent_at"]
+                for row in cursor.fetchall()
+            }
+
+        now = _now_us()
+        results: list[tuple[bool, bool]] = []
+        for key in keys:
+            sent_at = last_sent.get(key)
+            if sent_at is None:
+                results.append((True, False))
+            elif now - sent_at > self._remind_after_us:
+                results.append((True, True))
+            else:
+                results.append((False, False))
+        return results
+
+    def check_and_fetch(
+        self,
+        mac: str,
+        observed: ObservedEndpoint | None,
+    ) -> tuple[bool, bool, datetime | None]:
+        """
+        Combined alert-dedup check and first-move-time fetch.
+
+        Does the work of should_send_alert plus get_first_move_time over a
+        single connection, so the confirmed-move path costs one DB round
+        trip instead of two.
+
+        Returns:
+            Tuple of (should_send, is_reminder, first_move_seen_at)
+        """
+        observed_switch = observed.switch_name if observed else None
+        observed_port = observed.port_name if observed else None
+        alert_hash = self._compute_alert_hash(mac, observed_switch, observed_port)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(_SQL_GET_FIRST_MOVE, (mac,))
+            row = cursor.fetchone()
+            first_seen = None
+            if row and row["first_move_seen_at"]:
+                first_seen = _us_to_datetime(row["first_move_seen_at"])
+
+            cursor.execute(_SQL_SELECT_LAST_ALERT, (mac, alert_hash))
+            row = cursor.fetchone()
+
+        if not row:
+            # No previous alert for this situation
+            return (True, False, first_seen)
+
+        if _now_us() - row["sent_at"] > self._remind_after_us:
+            # Enough time has passed - send reminder
+            return (True, True, first_seen)
+
+        # Too soon to send another alert
+        return (False, False, first_seen)
+
     def record_alert(
         self,
         mac: str,
@@ -293,16 +602,12 @@ class StateManager:
         observed_switch = observed.switch_name if observed else None
         observed_port = observed.port_name if observed else None
         alert_hash = self._compute_alert_hash(mac, observed_switch, observed_port)
-        now = datetime.utcnow().isoformat()
+        now = _now_us()
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT INTO alert_history
-                (mac_address, alert_hash, sent_at, observed_switch, observed_port, is_reminder)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_INSERT_ALERT,
                 (
                     mac,
                     alert_hash,
@@ -312,17 +617,63 @@ class StateManager:
                     1 if is_reminder else 0,
                 ),
             )
-            conn.commit()
 
-    def cleanup_old_alerts(self, days: int = 30) -> int:
-        """Remove alert history older than N days."""
-        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    def try_record_alert(
+        self,
+        mac: str,
+        observed: ObservedEndpoint | None,
+    ) -> tuple[bool, bool]:
+        """
+        Check the dedup window and record the alert in one statement.
+
+        The guarded INSERT only lands outside the remind-after window, and
+        is_reminder is computed in-engine, so the check-then-record pattern
+        costs a single B-tree probe plus an optional insert. Callers that
+        must only record after a successful delivery (the notifier path)
+        should keep using check_and_fetch + record_alert instead.
+
+        Returns:
+            Tuple of (recorded, is_reminder)
+        """
+        observed_switch = observed.switch_name if observed else None
+        observed_port = observed.port_name if observed else None
+        alert_hash = self._compute_alert_hash(mac, observed_switch, observed_port)
+        now = _now_us()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "DELETE FROM alert_history WHERE sent_at < ?",
-                (cutoff,),
+                _SQL_TRY_INSERT_ALERT,
+                (
+                    mac,
+                    alert_hash,
+                    now,
+                    observed_switch,
+                    observed_port,
+                    mac,
+                    alert_hash,
+                    mac,
+                    alert_hash,
+                    now - self._remind_after_us,
+                ),
             )
+            row = cursor.fetchone()
+
+        if row is None:
+            # Inside the dedup window - nothing recorded
+            return (False, False)
+        return (True, bool(row["is_reminder"]))
+
+    def cleanup_old_alerts(self, days: int = 30) -> int:
+        """Remove alert history older than N days."""
+        cutoff = _now_us() - days * 86_400_000_000
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_CLEANUP_ALERTS, (cutoff,))
             deleted = cursor.rowcount
-            conn.commit()
+            # Return freed pages to the filesystem (no-op unless the DB
+            # was created with auto_vacuum=INCREMENTAL), then truncate the
+            # WAL so the just-freed pages don't linger in the log file
+            conn.execute("PRAGMA incremental_vacuum(1000)")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             return deleted
@@ -1,7 +1,6 @@
 """Tests for state management module."""
 
-import os
-import tempfile
+import sqlite3
 from datetime import datetime, timedelta
 
 import pytest
@@ -17,25 +16,35 @@ from netbox_agent.models import (
 from netbox_agent.state import StateManager
 
 
-@pytest.fixture
-def temp_db(monkeypatch):
-    """Create a temporary database."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
-
+def _set_state_env(monkeypatch, db_path: str) -> None:
     monkeypatch.setenv("NETBOX_URL", "https://netbox.example.com")
     monkeypatch.setenv("NETBOX_TOKEN", "test-token")
     monkeypatch.setenv("MM_WEBHOOK_URL", "https://mm.example.com/hooks/xxx")
     monkeypatch.setenv("STATE_DB_PATH", db_path)
     monkeypatch.setenv("REMIND_AFTER", "1h")
 
-    yield db_path
 
-    # Cleanup
-    try:
-        os.unlink(db_path)
-    except OSError:
-        pass
+@pytest.fixture
+def temp_db(monkeypatch):
+    """Point the state database at an in-memory SQLite database.
+
+    Unit tests don't care about the file; :memory: skips all disk I/O.
+    Persistence itself is covered by test_state_persists_to_file.
+    """
+    _set_state_env(monkeypatch, ":memory:")
+    yield ":memory:"
+
+
+@pytest.fixture
+def temp_db_file(monkeypatch, tmp_path):
+    """Create a temporary on-disk database for persistence tests.
+
+    tmp_path keeps the -wal/-shm siblings in a directory pytest cleans
+    up itself, so no manual unlink is needed.
+    """
+    db_path = str(tmp_path / "state.db")
+    _set_state_env(monkeypatch, db_path)
+    yield db_path
 
 
 def make_event(
@@ -139,6 +148,39 @@ class TestStateManager:
         counter = manager.update_state(event2)
         assert counter == 1
 
+    def test_update_states_bulk(self, temp_db):
+        """Test batched state updates match per-event results."""
+        manager = StateManager()
+
+        move = make_event(
+            "aa:bb:cc:dd:ee:ff",
+            MoveStatus.MOVE_DETECTED,
+            "switch2",
+            "Ethernet5",
+        )
+        ok = make_event("11:22:33:44:55:66", MoveStatus.OK)
+
+        counters = manager.update_states([move, ok])
+        assert counters.get("aa:bb:cc:dd:ee:ff") == 1
+        assert counters.get("11:22:33:44:55:66", 0) == 0
+
+        # A second batch with the same move increments the counter
+        counters = manager.update_states([move])
+        assert counters.get("aa:bb:cc:dd:ee:ff") == 2
+        assert manager.get_move_counter("aa:bb:cc:dd:ee:ff") == 2
+
+        # A suspect-uplink observation reports 0 for the cycle but leaves
+        # the stored counter untouched
+        suspect = make_event(
+            "aa:bb:cc:dd:ee:ff",
+            MoveStatus.SUSPECT_UPLINK,
+            "switch2",
+            "Ethernet5",
+        )
+        counters = manager.update_states([suspect])
+        assert counters.get("aa:bb:cc:dd:ee:ff") == 0
+        assert manager.get_move_counter("aa:bb:cc:dd:ee:ff") == 2
+
     def test_should_send_alert_first_time(self, temp_db):
         """Test first alert should be sent."""
         manager = StateManager()
@@ -167,6 +209,40 @@ class TestStateManager:
 
         assert should_send is False
 
+    def test_should_send_alerts_batch(self, temp_db):
+        """Test batched dedup check matches the single-item results."""
+        manager = StateManager()
+
+        observed = ObservedEndpoint(switch_name="switch2", port_name="Ethernet5")
+        items = [
+            ("aa:bb:cc:dd:ee:ff", observed),
+            ("11:22:33:44:55:66", None),
+        ]
+
+        # Nothing recorded yet - both should send as fresh alerts
+        assert manager.should_send_alerts(items) == [(True, False), (True, False)]
+
+        # Recording one suppresses only that pair
+        manager.record_alert("aa:bb:cc:dd:ee:ff", observed)
+        assert manager.should_send_alerts(items) == [(False, False), (True, False)]
+
+        assert manager.should_send_alerts([]) == []
+
+    def test_try_record_alert(self, temp_db):
+        """Test combined dedup check and alert recording."""
+        manager = StateManager()
+
+        observed = ObservedEndpoint(switch_name="switch2", port_name="Ethernet5")
+
+        # First call records a fresh alert
+        recorded, is_reminder = manager.try_record_alert("aa:bb:cc:dd:ee:ff", observed)
+        assert recorded is True
+        assert is_reminder is False
+
+        # Second call inside the dedup window records nothing
+        recorded, is_reminder = manager.try_record_alert("aa:bb:cc:dd:ee:ff", observed)
+        assert recorded is False
+
     def test_get_first_move_time(self, temp_db):
         """Test getting first move time."""
         manager = StateManager()
@@ -193,3 +269,72 @@ class TestStateManager:
         # Cleanup (0 days = all)
         deleted = manager.cleanup_old_alerts(days=0)
         assert deleted == 1
+
+    def test_pre_migration_db_is_recreated(self, temp_db_file):
+        """Test a TEXT-timestamp database from old versions is rebuilt."""
+        conn = sqlite3.connect(temp_db_file)
+        conn.executescript(
+            """
+            CREATE TABLE mac_state (
+                mac_address TEXT PRIMARY KEY,
+                server_name TEXT NOT NULL,
+                last_ok_seen_at TEXT,
+                last_observed_switch TEXT,
+                last_observed_port TEXT,
+                last_observed_vlan INTEGER,
+                move_counter INTEGER DEFAULT 0,
+                first_move_seen_at TEXT,
+                last_move_seen_at TEXT,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE alert_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                mac_address TEXT NOT NULL,
+                alert_hash TEXT NOT NULL,
+                sent_at TEXT NOT NULL,
+                observed_switch TEXT,
+                observed_port TEXT,
+                is_reminder INTEGER DEFAULT 0
+            );
+            INSERT INTO mac_state
+            (mac_address, server_name, move_counter, first_move_seen_at, updated_at)
+            VALUES ('aa:bb:cc:dd:ee:ff', 'server1', 2,
+                    '2024-01-01T00:00:00', '2024-01-01T00:00:00');
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        manager = StateManager()
+
+        # Old rows are gone, and the timestamp paths work again
+        assert manager.get_move_counter("aa:bb:cc:dd:ee:ff") == 0
+        assert manager.get_first_move_time("aa:bb:cc:dd:ee:ff") is None
+
+        event = make_event(
+            "aa:bb:cc:dd:ee:ff",
+            MoveStatus.MOVE_DETECTED,
+            "switch2",
+            "Ethernet5",
+        )
+        assert manager.update_state(event) == 1
+        assert isinstance(
+            manager.get_first_move_time("aa:bb:cc:dd:ee:ff"), datetime
+        )
+        manager.close()
+
+    def test_state_persists_to_file(self, temp_db_file):
+        """Test state survives reopening the database file."""
+        manager = StateManager()
+        event = make_event(
+            "aa:bb:cc:dd:ee:ff",
+            MoveStatus.MOVE_DETECTED,
+            "switch2",
+            "Ethernet5",
+        )
+        manager.update_state(event)
+        manager.close()
+
+        reopened = StateManager()
+        assert reopened.get_move_counter("aa:bb:cc:dd:ee:ff") == 1
+        reopened.close()